@@ -0,0 +1,86 @@
+# A one-year backfill of 30 minute history samples: one SELECT per sample as refreshes used to
+# write them, against the samples upsert, daily highs and bulk upsert save_readings does now
+# Run with `python -m benchmarks.backfill`
+import random
+import timeit
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlmodel import Session, delete, select
+
+from benchmarks import common  # noqa: F401 Throwaway settings before weatherdan is imported
+from weatherdan.database import create_db_and_tables, engine
+from weatherdan.ecowitt.category import Category
+from weatherdan.ingest import save_readings
+from weatherdan.models import Rainfall, Sample
+from weatherdan.rollups import ROLLUP_MODELS, rebuild_rollups
+
+DAYS = 365
+
+
+def generate_samples() -> dict[datetime, Decimal]:
+    generator = random.Random(7)
+    start = datetime.now().replace(minute=0, second=0, microsecond=0) - timedelta(days=DAYS)
+    return {
+        (start + timedelta(minutes=30 * x)).astimezone(): Decimal(
+            generator.randint(0, 9999)
+        ).scaleb(-2)
+        for x in range(DAYS * 48)
+    }
+
+
+def reset() -> None:
+    with Session(engine) as session:
+        session.exec(delete(Rainfall))
+        session.exec(delete(ROLLUP_MODELS[Rainfall]))
+        session.exec(delete(Sample))
+        session.commit()
+
+
+def list_values() -> list[tuple]:
+    with Session(engine) as session:
+        return [
+            (x.datestamp, x.value)
+            for x in session.exec(select(Rainfall).order_by(Rainfall.datestamp)).all()
+        ]
+
+
+def main() -> None:
+    create_db_and_tables()
+    samples = generate_samples()
+
+    def per_row() -> None:
+        with Session(engine) as session:
+            for timestamp, value in samples.items():
+                if reading := session.get(Rainfall, timestamp.date()):
+                    reading.value = max(reading.value, value)
+                else:
+                    reading = Rainfall(datestamp=timestamp.date(), value=value)
+                session.add(reading)
+            rebuild_rollups(session=session, model=Rainfall)
+            session.commit()
+
+    def bulk() -> None:
+        with Session(engine) as session:
+            save_readings(
+                session=session,
+                category=Category.RAINFALL,
+                device="benchmark",
+                history_readings=samples,
+            )
+            session.commit()
+
+    results = {}
+    for name, function in (("per row", per_row), ("bulk", bulk)):
+        timings = []
+        for _ in range(3):
+            reset()
+            timings.append(timeit.timeit(function, number=1))
+        results[name] = list_values()
+        print(f"{name:<8} {min(timings) * 1000:7.0f}ms for {len(samples)} samples")
+    assert results["per row"] == results["bulk"]
+    print(f"Same {len(results['bulk'])} daily readings")
+
+
+if __name__ == "__main__":
+    main()
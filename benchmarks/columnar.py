@@ -0,0 +1,75 @@
+# Weekly, monthly and yearly aggregation with the NumPy engine against the utils functions it
+# replaced, on synthetic datasets of 10, 50 and 100 years
+# Run with `python -m benchmarks.columnar`
+from datetime import date, timedelta
+from decimal import Decimal
+
+from benchmarks.common import generate_readings, timed
+from weatherdan import utils
+from weatherdan.aggregation import Aggregation
+from weatherdan.columnar import Columns, calculate_columnar_rollups
+from weatherdan.models import Reading, WeekReading
+from weatherdan.rollups import ROLLUP_TIMEFRAMES
+
+
+def aggregate_utils(entries: list[Reading]) -> list[list[tuple]]:
+    results = []
+    for timeframe in ROLLUP_TIMEFRAMES:
+        for aggregation in Aggregation:
+            function = getattr(
+                utils, f"get_{timeframe.value.lower()}_{aggregation.value.lower()}_readings"
+            )
+            results.append(
+                sorted(
+                    (x.start_datestamp, x.value)
+                    if isinstance(x, WeekReading)
+                    else (x.datestamp, x.value)
+                    for x in function(entries=entries)
+                )
+            )
+    return results
+
+
+def aggregate_columns(columns: Columns) -> list[list[tuple]]:
+    results = []
+    for timeframe in ROLLUP_TIMEFRAMES:
+        rollups = calculate_columnar_rollups(columns=columns, timeframe=timeframe)
+        results.extend(
+            [
+                [(x, total) for x, _, total, *_ in rollups],
+                [(x, high) for x, *_, high, _ in rollups],
+                [(x, round(total / count, 2)) for x, _, total, count, *_ in rollups],
+                [(x, low) for x, *_, low in rollups],
+            ]
+        )
+    return results
+
+
+def main() -> None:
+    for years in (10, 50, 100):
+        readings = generate_readings(
+            start=date.today() - timedelta(days=years * 365), days=years * 365
+        )
+        entries = [Reading(datestamp=x, value=y) for x, y in readings.items()]
+
+        def load(readings: dict[date, Decimal] = readings) -> Columns:
+            return Columns.from_values(datestamps=list(readings), values=list(readings.values()))
+
+        def python(entries: list[Reading] = entries) -> list[list[tuple]]:
+            return aggregate_utils(entries=entries)
+
+        columns = load()
+
+        def numpy(columns: Columns = columns) -> list[list[tuple]]:
+            return aggregate_columns(columns=columns)
+
+        assert numpy() == python()
+        print(
+            f"{years:>3} years {len(entries):>6} rows:"
+            f" utils {timed(python, number=1):7.1f}ms"
+            f"  numpy {timed(numpy, number=3):6.1f}ms (+{timed(load, number=3):5.1f}ms load)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+__all__ = ["create_environment", "generate_readings", "seed_database", "serve", "timed"]
+
+import atexit
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(tempfile.mkdtemp(prefix="weatherdan-benchmarks-"))
+atexit.register(shutil.rmtree, ROOT, ignore_errors=True)
+
+
+def create_environment(name: str, settings: str = "") -> dict[str, str]:
+    # Each run gets its own settings, database and caches, Ecowitt is never called
+    root = ROOT / name
+    (root / "config" / "weatherdan").mkdir(parents=True)
+    (root / "config" / "weatherdan" / "settings.toml").write_text(
+        f"[ecowitt]\nrefresh_interval = 0\n{settings}"
+    )
+    return {
+        "XDG_CACHE_HOME": str(root / "cache"),
+        "XDG_CONFIG_HOME": str(root / "config"),
+        "XDG_DATA_HOME": str(root / "data"),
+    }
+
+
+# weatherdan reads its settings when imported, so benchmarks import this module first
+os.environ.update(create_environment(name="local"))
+
+
+def generate_readings(start: date, days: int, seed: int = 1) -> dict[date, Decimal]:
+    generator = random.Random(seed)
+    return {
+        start + timedelta(days=x): Decimal(generator.randint(0, 5000)).scaleb(-2)
+        for x in range(days)
+    }
+
+
+def seed_database(environment: dict[str, str], years: int) -> None:
+    # Runs in a subprocess so it uses the environment's settings rather than this process's
+    script = (
+        "import random\n"
+        "from datetime import date, timedelta\n"
+        "from decimal import Decimal\n"
+        "from sqlmodel import Session\n"
+        "from weatherdan.database import create_db_and_tables, engine\n"
+        "from weatherdan.queries import upsert_readings\n"
+        "from weatherdan.rollups import ROLLUP_MODELS, rebuild_rollups\n"
+        "create_db_and_tables()\n"
+        f"start = date.today() - timedelta(days={years} * 365)\n"
+        "with Session(engine) as session:\n"
+        "    for index, model in enumerate(ROLLUP_MODELS):\n"
+        "        generator = random.Random(index)\n"
+        "        readings = {\n"
+        "            start + timedelta(days=x): Decimal(generator.randint(0, 5000)).scaleb(-2)\n"
+        f"            for x in range({years} * 365 + 1)\n"
+        "        }\n"
+        "        upsert_readings(session=session, model=model, readings=readings)\n"
+        "        rebuild_rollups(session=session, model=model)\n"
+        "    session.commit()\n"
+    )
+    subprocess.run(  # noqa: S603
+        [sys.executable, "-c", script], env={**os.environ, **environment}, check=True
+    )
+
+
+@contextmanager
+def serve(environment: dict[str, str], port: int) -> Iterator[str]:
+    base_url = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(  # noqa: S603
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "weatherdan.__main__:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        env={**os.environ, **environment},
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"{base_url}/api/cache")
+                break
+            except httpx.HTTPError:
+                if server.poll() is not None:
+                    break
+                time.sleep(0.2)
+        else:
+            msg = f"Server on port {port} didn't start"
+            raise RuntimeError(msg)
+        if server.poll() is not None:
+            msg = f"Server on port {port} exited with {server.returncode}"
+            raise RuntimeError(msg)
+        yield base_url
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def timed(function: Callable[[], object], number: int = 10, repeat: int = 3) -> float:
+    # Best of the repeats, in milliseconds per call
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number * 1000
@@ -0,0 +1,51 @@
+# Daily readings latency as the table grows: the ranged, limited SQL query against loading the
+# whole table and filtering it in Python, as the endpoints did before
+# Run with `python -m benchmarks.daily_readings`
+from datetime import date, timedelta
+
+from sqlmodel import Session, delete, select
+
+from benchmarks.common import generate_readings, timed
+from weatherdan.database import create_db_and_tables, engine
+from weatherdan.models import Rainfall
+from weatherdan.queries import get_daily_series, upsert_readings
+from weatherdan.utils import get_daily_readings
+
+MAX_ENTRIES = 28
+
+
+def main() -> None:
+    create_db_and_tables()
+    for years in (1, 5, 20, 50):
+        with Session(engine) as session:
+            session.exec(delete(Rainfall))
+            upsert_readings(
+                session=session,
+                model=Rainfall,
+                readings=generate_readings(
+                    start=date.today() - timedelta(days=years * 365), days=years * 365
+                ),
+            )
+            session.commit()
+
+            def full_scan(session: Session = session) -> list:
+                entries = sorted(session.exec(select(Rainfall)).all())
+                return get_daily_readings(entries=entries)[-MAX_ENTRIES:]
+
+            def ranged(session: Session = session) -> list:
+                return get_daily_series(
+                    session=session, model=Rainfall, max_entries=MAX_ENTRIES
+                ).to_readings()
+
+            assert [(x.datestamp, x.value) for x in full_scan()] == [
+                (x.datestamp, x.value) for x in ranged()
+            ]
+            print(
+                f"{years:>2} years {years * 365:>6} rows:"
+                f" full scan {timed(full_scan, number=3):8.2f}ms"
+                f"  ranged {timed(ranged, number=50):6.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# Concurrent dashboard load against a server in the sync (threadpool) and async engine modes,
+# with the response cache off so every request queries the database
+# Run with `python -m benchmarks.load`
+import asyncio
+import statistics
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.common import create_environment, seed_database, serve
+
+YEARS = 20
+REQUESTS = 400
+CONCURRENCY = 64
+ENDPOINTS = [
+    ("dashboard weekly", "/api/dashboard", {"timeframe": "Weekly", "max-entries": 52}),
+    ("dashboard daily", "/api/dashboard", {"timeframe": "Daily", "max-entries": 28}),
+    ("wind daily x365", "/api/wind", {"timeframe": "Daily", "max-entries": 365}),
+]
+
+
+async def hammer(
+    base_url: str, path: str, params: dict[str, str | int], total: int
+) -> tuple[float, float, float]:
+    latencies = []
+    queue = asyncio.Queue()
+    for index in range(total):
+        queue.put_nowait(index)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+
+        async def worker() -> None:
+            while not queue.empty():
+                queue.get_nowait()
+                start = time.perf_counter()
+                response = await client.get(path, params=params)
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+        elapsed = time.perf_counter() - start
+    latencies.sort()
+    return total / elapsed, statistics.median(latencies) * 1000, latencies[total * 95 // 100] * 1000
+
+
+def main() -> None:
+    seeded = create_environment(name="load-seed")
+    seed_database(environment=seeded, years=YEARS)
+    database_name = Path(seeded["XDG_DATA_HOME"]) / "weatherdan" / "weatherdan.sqlite"
+    for port, asynchronous in ((26001, False), (26002, True)):
+        mode = "async" if asynchronous else "sync"
+        environment = create_environment(
+            name=f"load-{mode}",
+            settings=(
+                f'[database]\ndatabase_name = "{database_name}"\n'
+                f"asynchronous = {str(asynchronous).lower()}\npool_size = 20\nmax_overflow = 20\n"
+                "[website]\ncache_size = 0\n"
+            ),
+        )
+        with serve(environment=environment, port=port) as base_url:
+            for label, path, params in ENDPOINTS:
+                asyncio.run(hammer(base_url=base_url, path=path, params=params, total=20))
+                rps, p50, p95 = asyncio.run(
+                    hammer(base_url=base_url, path=path, params=params, total=REQUESTS)
+                )
+                print(f"{mode:<5} {label:<17} {rps:6.0f} req/s  p50 {p50:6.1f}ms  p95 {p95:6.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# Read latency while `run.py import` backfills, with SQLite's rollback journal and a single pool
+# against the default WAL profile with a read-only pool for GET routes
+# Run with `python -m benchmarks.read_under_backfill`
+import asyncio
+import csv
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from datetime import date, timedelta
+from pathlib import Path
+
+import httpx
+
+from benchmarks.common import ROOT, create_environment, generate_readings, seed_database, serve
+
+YEARS = 20
+BACKFILL_YEARS = 60
+RUN_SCRIPT = Path(__file__).resolve().parents[1] / "run.py"
+PROFILES = [
+    ("rollback", 26011, '[database.sqlite]\njournal_mode = "DELETE"\nread_only_pool = false\n'),
+    ("wal", 26012, ""),
+]
+
+
+async def read(base_url: str, until: Callable[[], bool]) -> tuple[int, float, float, float, int]:
+    latencies = []
+    errors = 0
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+
+        async def worker() -> None:
+            nonlocal errors
+            while not until():
+                start = time.perf_counter()
+                response = await client.get(
+                    "/api/wind", params={"timeframe": "Monthly", "max-entries": 120}
+                )
+                latencies.append(time.perf_counter() - start)
+                errors += response.status_code != 200
+
+        await asyncio.gather(*(worker() for _ in range(8)))
+    latencies.sort()
+    return (
+        len(latencies),
+        statistics.median(latencies) * 1000,
+        latencies[len(latencies) * 99 // 100] * 1000,
+        latencies[-1] * 1000,
+        errors,
+    )
+
+
+def write_backfill(path: Path) -> None:
+    start = date.today() - timedelta(days=BACKFILL_YEARS * 365)
+    columns = {
+        name: generate_readings(start=start, days=BACKFILL_YEARS * 365, seed=index + 10)
+        for index, name in enumerate(("rainfall", "solar", "uv_index", "wind"))
+    }
+    with path.open("w", newline="") as stream:
+        writer = csv.writer(stream)
+        writer.writerow(["datestamp", *columns])
+        for key in columns["wind"]:
+            writer.writerow([key.isoformat(), *(x[key] for x in columns.values())])
+
+
+def main() -> None:
+    seeded = create_environment(name="backfill-seed")
+    seed_database(environment=seeded, years=YEARS)
+    seed_path = Path(seeded["XDG_DATA_HOME"]) / "weatherdan" / "weatherdan.sqlite"
+    backfill = ROOT / "backfill.csv"
+    write_backfill(path=backfill)
+    for name, port, settings in PROFILES:
+        # The response cache is off so every read queries the database
+        environment = create_environment(
+            name=f"backfill-{name}", settings=f"{settings}[website]\ncache_size = 0\n"
+        )
+        database_path = Path(environment["XDG_DATA_HOME"]) / "weatherdan" / "weatherdan.sqlite"
+        database_path.parent.mkdir(parents=True)
+        with sqlite3.connect(seed_path) as source, sqlite3.connect(database_path) as target:
+            source.backup(target)
+            target.execute("PRAGMA journal_mode = DELETE")
+        with serve(environment=environment, port=port) as base_url:
+            end = time.perf_counter() + 5
+            count, p50, p99, worst, errors = asyncio.run(
+                read(base_url=base_url, until=lambda end=end: time.perf_counter() > end)
+            )
+            print(
+                f"{name:<8} idle     {count:5d} reads  p50 {p50:6.1f}ms  p99 {p99:7.1f}ms"
+                f"  max {worst:7.1f}ms  errors {errors}"
+            )
+            start = time.perf_counter()
+            writer = subprocess.Popen(  # noqa: S603
+                [sys.executable, str(RUN_SCRIPT), "import", str(backfill), "--policy", "replace"],
+                env={**os.environ, **environment},
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            count, p50, p99, worst, errors = asyncio.run(
+                read(base_url=base_url, until=lambda writer=writer: writer.poll() is not None)
+            )
+            print(
+                f"{name:<8} backfill {count:5d} reads  p50 {p50:6.1f}ms  p99 {p99:7.1f}ms"
+                f"  max {worst:7.1f}ms  errors {errors}"
+                f"  (writer {time.perf_counter() - start:.1f}s, exit {writer.returncode})"
+            )
+
+
+if __name__ == "__main__":
+    main()
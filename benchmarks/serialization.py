@@ -0,0 +1,66 @@
+# Serialisation cost of one list_readings response at 1k and 10k points: FastAPI's default
+# response_model path, a pydantic TypeAdapter, and Series rendering its rows and columns layouts,
+# built per call and cached
+# Run with `python -m benchmarks.serialization`
+import asyncio
+from datetime import date, timedelta
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import TypeAdapter
+
+from benchmarks.common import generate_readings, timed
+from weatherdan.models import Reading
+from weatherdan.series import Layout, Series
+
+FIELD = create_response_field(name="Response_List_Readings", type_=list[Reading])
+ADAPTER = TypeAdapter(list[Reading])
+
+
+def main() -> None:
+    loop = asyncio.new_event_loop()
+    print(
+        "points  FastAPI path  TypeAdapter  Series rows  Series columns  Series cached"
+        "  rows size  columns size"
+    )
+    for points in (1000, 10000):
+        rows = list(
+            generate_readings(start=date.today() - timedelta(days=points), days=points).items()
+        )
+        readings = [Reading(datestamp=x, value=y) for x, y in rows]
+
+        def fastapi(readings: list[Reading] = readings) -> bytes:
+            content = loop.run_until_complete(
+                serialize_response(field=FIELD, response_content=readings)
+            )
+            return JSONResponse(content=content).body
+
+        def adapter(readings: list[Reading] = readings) -> bytes:
+            return ADAPTER.dump_json(readings)
+
+        # A new Series each call, so building it is timed along with rendering
+        def series_rows(rows: list = rows) -> bytes:
+            return Series.from_rows(rows=rows).to_json(layout=Layout.ROWS)
+
+        def series_columns(rows: list = rows) -> bytes:
+            return Series.from_rows(rows=rows).to_json(layout=Layout.COLUMNS)
+
+        # What a response cache hit costs, the series keeps its rendered bytes
+        cached = Series.from_rows(rows=rows)
+
+        def series_cached(series: Series = cached) -> bytes:
+            return series.to_json(layout=Layout.ROWS)
+
+        assert fastapi() == adapter() == series_rows() == series_cached()
+        print(
+            f"{points:>6}  {timed(fastapi):9.2f} ms  {timed(adapter):8.2f} ms"
+            f"  {timed(series_rows):8.2f} ms  {timed(series_columns):11.2f} ms"
+            f"  {timed(series_cached, number=1000):10.4f} ms"
+            f"  {len(series_rows()) / 1000:6.1f} KB  {len(series_columns()) / 1000:9.1f} KB"
+        )
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# Building a whole-table response: a Reading/WeekReading model per row serialised by pydantic,
+# against the array-backed Series rendering its own JSON
+# Run with `python -m benchmarks.series`
+import tracemalloc
+from collections.abc import Callable
+from datetime import date, timedelta
+
+from pydantic import TypeAdapter
+from sqlmodel import Session, delete
+
+from benchmarks.common import generate_readings, timed
+from weatherdan.aggregation import Aggregation
+from weatherdan.database import create_db_and_tables, engine
+from weatherdan.models import Reading, WeekReading, Wind
+from weatherdan.queries import get_daily_series, list_daily_readings, upsert_readings
+from weatherdan.rollups import get_rollup_series, list_rollups, rebuild_rollups, to_rollup_reading
+from weatherdan.timeframe import Timeframe
+
+YEARS = 50
+ADAPTER = TypeAdapter(list[Reading | WeekReading])
+
+
+def get_peak(function: Callable[[], bytes]) -> float:
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1e6
+
+
+def main() -> None:
+    create_db_and_tables()
+    with Session(engine) as session:
+        session.exec(delete(Wind))
+        upsert_readings(
+            session=session,
+            model=Wind,
+            readings=generate_readings(
+                start=date.today() - timedelta(days=YEARS * 365), days=YEARS * 365
+            ),
+        )
+        rebuild_rollups(session=session, model=Wind)
+        session.commit()
+
+        for timeframe in (Timeframe.DAILY, Timeframe.WEEKLY, Timeframe.MONTHLY):
+
+            def models(session: Session = session, timeframe: Timeframe = timeframe) -> bytes:
+                if timeframe == Timeframe.DAILY:
+                    readings = list_daily_readings(session=session, model=Wind, max_entries=0)
+                else:
+                    readings = [
+                        to_rollup_reading(
+                            rollup=x, timeframe=timeframe, aggregation=Aggregation.TOTAL
+                        )
+                        for x in list_rollups(
+                            session=session, model=Wind, timeframe=timeframe, max_entries=0
+                        )
+                    ]
+                return ADAPTER.dump_json(readings)
+
+            def series(session: Session = session, timeframe: Timeframe = timeframe) -> bytes:
+                if timeframe == Timeframe.DAILY:
+                    result = get_daily_series(session=session, model=Wind, max_entries=0)
+                else:
+                    result = get_rollup_series(
+                        session=session,
+                        model=Wind,
+                        timeframe=timeframe,
+                        aggregation=Aggregation.TOTAL,
+                        max_entries=0,
+                    )
+                return result.to_json()
+
+            assert models() == series()
+            print(
+                f"{timeframe.value:<8} {len(ADAPTER.validate_json(series())):>6} rows:"
+                f" models {timed(models, number=3):7.1f}ms {get_peak(models):5.1f}MB peak"
+                f"  series {timed(series, number=3):7.1f}ms {get_peak(series):5.1f}MB peak"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,196 @@
+import logging
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+
 import uvicorn
+from sqlmodel import Session
 
+from weatherdan import elapsed_timer, setup_logging
 from weatherdan.constants import constants
+from weatherdan.database import convert_tables, create_db_and_tables, engine
+from weatherdan.export import FileFormat
+from weatherdan.importer import IMPORT_BATCH_SIZE, import_readings, read_rows
+from weatherdan.ingest import CATEGORY_MODELS
+from weatherdan.queries import ConflictPolicy, upsert_readings
+from weatherdan.rollups import ROLLUP_MODELS, rebuild_rollups
+from weatherdan.samples import list_daily_highs
+from weatherdan.storage import copy_readings, round_readings
+
+LOGGER = logging.getLogger("weatherdan")
+
+
+def log_restart() -> None:
+    # A running server only drops cached responses and ETags for writes made through it
+    LOGGER.warning("Restart any running Weatherdan server so it serves the changes")
+
+
+def rebuild() -> None:
+    setup_logging()
+    create_db_and_tables()
+    with Session(engine) as session, elapsed_timer() as elapsed:
+        for model in ROLLUP_MODELS:
+            rebuild_rollups(session=session, model=model)
+            LOGGER.info("Rebuilt %s rollups", model.__tablename__)
+        session.commit()
+    LOGGER.info("Rebuilt all rollups in %.2fs", elapsed())
+    log_restart()
+
+
+def derive() -> None:
+    setup_logging()
+    create_db_and_tables()
+    with Session(engine) as session, elapsed_timer() as elapsed:
+        for category, model in CATEGORY_MODELS.items():
+            readings = round_readings(
+                model=model, readings=list_daily_highs(session=session, category=category)
+            )
+            upsert_readings(session=session, model=model, readings=readings)
+            rebuild_rollups(session=session, model=model)
+            LOGGER.info("Derived %d %s readings", len(readings), model.__tablename__)
+        session.commit()
+    LOGGER.info("Derived all readings in %.2fs", elapsed())
+    log_restart()
+
+
+def migrate(reverse: bool) -> None:
+    setup_logging()
+    create_db_and_tables()
+    target = "per-category tables" if reverse else "reading table"
+    with Session(engine) as session, elapsed_timer() as elapsed:
+        for model in CATEGORY_MODELS.values():
+            count = copy_readings(session=session, model=model, reverse=reverse)
+            LOGGER.info("Copied %d %s readings to the %s", count, model.__tablename__, target)
+        session.commit()
+    LOGGER.info("Migrated all readings in %.2fs", elapsed())
+    log_restart()
+
+
+def convert() -> None:
+    setup_logging()
+    storage = "fixed point" if constants.settings.database.fixed_point else "decimals"
+    with elapsed_timer() as elapsed:
+        try:
+            converted = convert_tables()
+        except ValueError as err:
+            LOGGER.error("Nothing was converted: %s", err)  # noqa: TRY400
+            sys.exit(1)
+    for table, count in converted.items():
+        LOGGER.info("Converted %d %s rows to %s", count, table, storage)
+    LOGGER.info("Values are stored as %s, converted in %.2fs", storage, elapsed())
+    if converted:
+        log_restart()
+
+
+def load(
+    file: Path,
+    table: str | None,
+    file_format: FileFormat | None,
+    policy: ConflictPolicy,
+    batch_size: int,
+) -> None:
+    setup_logging()
+    if not file.is_file():
+        LOGGER.error("Unable to find import file: %s", file)
+        sys.exit(1)
+    if file_format is None:
+        try:
+            file_format = FileFormat(file.suffix.lstrip(".").lower())
+        except ValueError:
+            LOGGER.error(  # noqa: TRY400
+                "Unable to tell the format of %s from its extension, pass --format %s",
+                file,
+                " or ".join(x.value for x in FileFormat),
+            )
+            sys.exit(1)
+    create_db_and_tables()
+    models = {x.__tablename__: x for x in CATEGORY_MODELS.values()}
+    columns = {"value": models[table]} if table else models
+    with file.open(encoding="utf-8", newline="") as stream, Session(engine) as session:
+        try:
+            result = import_readings(
+                session=session,
+                rows=read_rows(file=stream, file_format=file_format),
+                columns=columns,
+                policy=policy,
+                batch_size=batch_size,
+            )
+        except ValueError as err:
+            LOGGER.error(err)  # noqa: TRY400
+            log_restart()
+            sys.exit(1)
+    LOGGER.info(
+        "Imported %d rows (%d readings) in %d batches, %.2fs at %.0f rows/s",
+        result.rows,
+        result.readings,
+        result.batches,
+        result.elapsed,
+        result.rows_per_second,
+    )
+    log_restart()
 
 
 def main() -> None:
+    parser = ArgumentParser(prog="Weatherdan")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("rebuild-rollups", help="Recalculate the weekly/monthly/yearly rollups.")
+    subparsers.add_parser(
+        "rebuild-readings", help="Recalculate the daily readings from the samples."
+    )
+    migrate_parser = subparsers.add_parser(
+        "migrate-readings", help="Copy the per-category readings into the unified reading table."
+    )
+    migrate_parser.add_argument(
+        "--reverse",
+        action="store_true",
+        help="Copy the unified reading table back into the per-category tables.",
+    )
+    subparsers.add_parser(
+        "migrate-values",
+        help="Convert the stored values to match the database.fixed_point setting.",
+    )
+    import_parser = subparsers.add_parser(
+        "import", help="Import readings from a CSV/NDJSON file in the export layout."
+    )
+    import_parser.add_argument("file", type=Path)
+    import_parser.add_argument(
+        "--category",
+        choices=[x.__tablename__ for x in CATEGORY_MODELS.values()],
+        help="Import a single category file (datestamp,value), defaults to all categories.",
+    )
+    import_parser.add_argument(
+        "--format",
+        dest="file_format",
+        choices=[x.value for x in FileFormat],
+        help="Defaults to the file extension.",
+    )
+    import_parser.add_argument(
+        "--policy", choices=[x.value for x in ConflictPolicy], default=ConflictPolicy.KEEP_MAX.value
+    )
+    import_parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    if args.command == "rebuild-rollups":
+        rebuild()
+        return
+    if args.command == "rebuild-readings":
+        derive()
+        return
+    if args.command == "migrate-readings":
+        migrate(reverse=args.reverse)
+        return
+    if args.command == "migrate-values":
+        convert()
+        return
+    if args.command == "import":
+        load(
+            file=args.file,
+            table=args.category,
+            file_format=FileFormat(args.file_format) if args.file_format else None,
+            policy=ConflictPolicy(args.policy),
+            batch_size=max(args.batch_size, 1),
+        )
+        return
     uvicorn.run(
         "weatherdan.__main__:app",
         host=constants.settings.website.host,
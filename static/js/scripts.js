@@ -177,38 +177,81 @@ function createGraph(elementId, labels, datasets, unit, unitLabel) {
 }
 
 async function refreshData(endpoint) {
-  const response = await submitRequest(endpoint, "PUT");
-  if (response !== null && response.status != 208)
-      window.location.reload();
+  let response = await submitRequest(endpoint, "PUT");
+  if (response === null || response.status == 208)
+    return;
+  const jobId = response.body.id;
+  while (response !== null && ["Queued", "Running"].includes(response.body.status)) {
+    await new Promise((resolve) => setTimeout(resolve, 2000));
+    response = await submitRequest(`/api/refresh/${jobId}`, "GET");
+  }
+  if (response !== null && response.body.status == "Succeeded")
+    window.location.reload();
 }
 
-async function loadTotalStats(timeframe, graphId, endpoint, unit, unitLabel, maxEntries) {
+function formatLabel(timeframe, value) {
+  if (timeframe == "Yearly")
+    return moment(value).format("YYYY");
+  if (timeframe == "Monthly")
+    return moment(value).format("MMM YYYY");
+  if (timeframe == "Hourly" || timeframe == "Raw")
+    return moment(value).format("Do MMM YYYY HH:mm");
+  return moment(value).format("Do MMM YYYY");
+}
+
+function getLabel(timeframe, entry) {
+  return formatLabel(timeframe, entry.timestamp || entry.start_datestamp || entry.datestamp);
+}
+
+function getStatsParams(timeframe, maxEntries) {
   const currentParams = new URLSearchParams(window.location.search);
-  const params = {
+  return new URLSearchParams({
     timeframe: timeframe,
     year: currentParams.get("year") || 0,
     month: currentParams.get("month") || 0,
     "max-entries": maxEntries,
-  };
+  });
+}
+
+function drawTotalStats(graphId, labels, values, unit, unitLabel) {
+  const datasets = [createDataset(0, values, "Total", "line")];
+  createGraph(graphId, labels, datasets, unit, unitLabel);
+}
+
+function drawGraphStats(timeframe, graphId, graphData, unit, unitLabel) {
+  const labels = graphData.high.map(x => getLabel(timeframe, x));
+  const datasets = [
+    createDataset(0, graphData.high.map(x => x.value), "High", "line"),
+    createDataset(1, graphData.average.map(x => x.value), "Average", "line"),
+    createDataset(2, graphData.low.map(x => x.value), "Low", "line"),
+  ];
+  createGraph(graphId, labels, datasets, unit, unitLabel);
+}
+
+async function loadTotalStats(timeframe, graphId, endpoint, unit, unitLabel, maxEntries) {
+  const params = getStatsParams(timeframe, maxEntries);
+  params.set("layout", "Columns");
+  const response = await submitRequest(endpoint + "?" + params, "GET");
+  if (response !== null) {
+    const labels = (response.body.timestamps || response.body.dates).map(x => formatLabel(timeframe, x));
+    drawTotalStats(graphId, labels, response.body.values, unit, unitLabel);
+  }
+}
+
+async function loadGraphStats(timeframe, graphId, endpoint, unit, unitLabel, maxEntries) {
+  const response = await submitRequest(endpoint + "/graph?" + getStatsParams(timeframe, maxEntries), "GET");
+  if (response !== null)
+    drawGraphStats(timeframe, graphId, response.body, unit, unitLabel);
+}
 
-  const response = await submitRequest(endpoint + "?" + new URLSearchParams(params), "GET");
+async function loadDashboard(timeframe, maxEntries) {
+  const response = await submitRequest("/api/dashboard?" + getStatsParams(timeframe, maxEntries), "GET");
   if (response !== null) {
-    const labels = [];
-    const datasets = [];
-    let entryData = [];
-    response.body.forEach((x, index) => {
-      if (timeframe == "Yearly")
-        labels.push(moment(x.datestamp).format("YYYY"));
-      else if (timeframe == "Monthly")
-        labels.push(moment(x.datestamp).format("MMM YYYY"));
-      else if (timeframe == "Weekly")
-        labels.push(moment(x.start_datestamp).format("Do MMM YYYY"));
-      else
-        labels.push(moment(x.datestamp).format("Do MMM YYYY"));
-      entryData.push(x.value);
-    });
-    datasets.push(createDataset(0, entryData, "Total", "line"));
-    createGraph(graphId, labels, datasets, unit, unitLabel);
+    const rainfall = response.body.rainfall.total;
+    drawTotalStats("rainfall-stats", rainfall.map(x => getLabel(timeframe, x)), rainfall.map(x => x.value), "mm", "Millimetres");
+    drawGraphStats(timeframe, "solar-stats", response.body.solar, "lx", "Lux");
+    drawGraphStats(timeframe, "uv-index-stats", response.body.uv_index, "", "Index");
+    drawGraphStats(timeframe, "wind-stats", response.body.wind, "km/h", "Kilometers per Hour");
   }
 }
 
@@ -217,13 +260,13 @@ async function loadRainfallStats(timeframe, graphId, maxEntries = getCookie("wea
 }
 
 async function loadSolarStats(timeframe, graphId, maxEntries = getCookie("weatherdan_max-entries") || 28) {
-  await loadTotalStats(timeframe, graphId, "/api/solar", "lx", "Lux", maxEntries);
+  await loadGraphStats(timeframe, graphId, "/api/solar", "lx", "Lux", maxEntries);
 }
 
 async function loadUVIndexStats(timeframe, graphId, maxEntries = getCookie("weatherdan_max-entries") || 28) {
-  await loadTotalStats(timeframe, graphId, "/api/uv-index", "", "Index", maxEntries);
+  await loadGraphStats(timeframe, graphId, "/api/uv-index", "", "Index", maxEntries);
 }
 
 async function loadWindStats(timeframe, graphId, maxEntries = getCookie("weatherdan_max-entries") || 28) {
-  await loadTotalStats(timeframe, graphId, "/api/wind", "km/h", "Kilometers per Hour", maxEntries);
+  await loadGraphStats(timeframe, graphId, "/api/wind", "km/h", "Kilometers per Hour", maxEntries);
 }
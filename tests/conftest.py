@@ -0,0 +1,87 @@
+import os
+import random
+import tempfile
+import time
+from collections.abc import Iterator
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+# Settings, the database and the caches live under the XDG folders, so point them somewhere
+# disposable before weatherdan is imported
+ROOT = Path(tempfile.mkdtemp(prefix="weatherdan-tests-"))
+for name in ("XDG_CACHE_HOME", "XDG_CONFIG_HOME", "XDG_DATA_HOME"):
+    os.environ[name] = str(ROOT / name.lower())
+(ROOT / "xdg_config_home" / "weatherdan").mkdir(parents=True)
+# No background refreshes, Ecowitt is never called
+(ROOT / "xdg_config_home" / "weatherdan" / "settings.toml").write_text(
+    "[ecowitt]\nrefresh_interval = 0\n"
+)
+
+import pytest  # noqa: E402
+from sqlalchemy import Engine  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from sqlmodel import Session, SQLModel, create_engine  # noqa: E402
+
+from weatherdan.models import Reading  # noqa: E402
+from weatherdan.queries import upsert_readings  # noqa: E402
+from weatherdan.rollups import ROLLUP_MODELS, rebuild_rollups  # noqa: E402
+
+
+def generate_readings(
+    model: type[Reading], start: date, days: int, seed: int = 1
+) -> dict[date, Decimal]:
+    # Values use the metric's own decimal places so they're valid with fixed point storage too,
+    # and a few days are skipped so buckets have uneven counts
+    places = model.__table__.columns["value"].type.scale
+    generator = random.Random(f"{model.__tablename__}-{seed}")
+    return {
+        start + timedelta(days=x): Decimal(generator.randint(0, 50000)).scaleb(-places)
+        for x in range(days)
+        if generator.random() > 0.05
+    }
+
+
+@pytest.fixture()
+def anyio_backend() -> str:
+    # Async tests run on anyio's pytest plugin, on asyncio only
+    return "asyncio"
+
+
+@pytest.fixture()
+def engine() -> Iterator[Engine]:
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+def session(engine: Engine) -> Iterator[Session]:
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture()
+def readings(session: Session) -> dict[type[Reading], dict[date, Decimal]]:
+    # Three years starting mid-week, so the first and last weeks are partial
+    readings = {
+        x: generate_readings(model=x, start=date(2022, 12, 28), days=3 * 365) for x in ROLLUP_MODELS
+    }
+    for model, values in readings.items():
+        upsert_readings(session=session, model=model, readings=values)
+        rebuild_rollups(session=session, model=model)
+    session.commit()
+    return readings
+
+
+@pytest.fixture()
+def timezone(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    # Parametrize indirectly with a TZ name
+    monkeypatch.setenv("TZ", request.param)
+    time.tzset()
+    yield request.param
+    monkeypatch.undo()
+    time.tzset()
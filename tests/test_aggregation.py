@@ -0,0 +1,131 @@
+from collections.abc import Callable
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlmodel import Session
+
+from weatherdan import utils
+from weatherdan.aggregation import Aggregation
+from weatherdan.models import Rainfall, Reading, Solar, WeekReading
+from weatherdan.rollups import get_rollup_series, update_rollups
+from weatherdan.timeframe import Timeframe
+
+# The original Python aggregation is kept in utils as the reference the rollups are checked against
+REFERENCES: dict[tuple[Timeframe, Aggregation], Callable[..., list[Reading | WeekReading]]] = {
+    (Timeframe.WEEKLY, Aggregation.TOTAL): utils.get_weekly_total_readings,
+    (Timeframe.WEEKLY, Aggregation.HIGH): utils.get_weekly_high_readings,
+    (Timeframe.WEEKLY, Aggregation.AVERAGE): utils.get_weekly_average_readings,
+    (Timeframe.WEEKLY, Aggregation.LOW): utils.get_weekly_low_readings,
+    (Timeframe.MONTHLY, Aggregation.TOTAL): utils.get_monthly_total_readings,
+    (Timeframe.MONTHLY, Aggregation.HIGH): utils.get_monthly_high_readings,
+    (Timeframe.MONTHLY, Aggregation.AVERAGE): utils.get_monthly_average_readings,
+    (Timeframe.MONTHLY, Aggregation.LOW): utils.get_monthly_low_readings,
+    (Timeframe.YEARLY, Aggregation.TOTAL): utils.get_yearly_total_readings,
+    (Timeframe.YEARLY, Aggregation.HIGH): utils.get_yearly_high_readings,
+    (Timeframe.YEARLY, Aggregation.AVERAGE): utils.get_yearly_average_readings,
+    (Timeframe.YEARLY, Aggregation.LOW): utils.get_yearly_low_readings,
+}
+FILTERS = [(None, None), (2023, None), (2024, 2), (2024, 12), (2025, 1), (2019, None)]
+
+
+def get_reference(
+    readings: dict[date, Decimal],
+    timeframe: Timeframe,
+    aggregation: Aggregation,
+    year: int | None,
+    month: int | None,
+) -> list[tuple]:
+    entries = [Reading(datestamp=x, value=y) for x, y in sorted(readings.items())]
+    if timeframe == Timeframe.DAILY:
+        results = utils.get_daily_readings(entries=entries, year=year, month=month)
+    elif timeframe == Timeframe.WEEKLY:
+        results = REFERENCES[timeframe, aggregation](entries=entries, year=year, month=month)
+    elif timeframe == Timeframe.MONTHLY:
+        results = REFERENCES[timeframe, aggregation](entries=entries, year=year)
+    else:
+        results = REFERENCES[timeframe, aggregation](entries=entries)
+    return sorted(to_tuple(reading=x) for x in results)
+
+
+def to_tuple(reading: Reading | WeekReading) -> tuple:
+    if isinstance(reading, WeekReading):
+        return reading.start_datestamp, reading.end_datestamp, reading.value
+    return reading.datestamp, reading.value
+
+
+def list_rollup_values(
+    session: Session,
+    model: type[Reading],
+    timeframe: Timeframe,
+    aggregation: Aggregation,
+    year: int | None,
+    month: int | None,
+) -> list[tuple]:
+    series = get_rollup_series(
+        session=session,
+        model=model,
+        timeframe=timeframe,
+        aggregation=aggregation,
+        year=year,
+        month=month,
+        max_entries=0,
+    )
+    return [to_tuple(reading=x) for x in series.to_readings()]
+
+
+@pytest.mark.parametrize("model", [Rainfall, Solar])
+@pytest.mark.parametrize(("timeframe", "aggregation"), [*REFERENCES, (Timeframe.DAILY, None)])
+def test_rollups_match_reference(
+    session: Session,
+    readings: dict[type[Reading], dict[date, Decimal]],
+    model: type[Reading],
+    timeframe: Timeframe,
+    aggregation: Aggregation | None,
+) -> None:
+    for year, month in FILTERS:
+        expected = get_reference(
+            readings=readings[model],
+            timeframe=timeframe,
+            aggregation=aggregation,
+            year=year,
+            month=month,
+        )
+        assert (
+            list_rollup_values(
+                session=session,
+                model=model,
+                timeframe=timeframe,
+                aggregation=aggregation,
+                year=year,
+                month=month,
+            )
+            == expected
+        ), (year, month)
+
+
+@pytest.mark.parametrize("timeframe", [Timeframe.WEEKLY, Timeframe.MONTHLY, Timeframe.YEARLY])
+def test_sql_group_by_matches_reference(
+    session: Session, readings: dict[type[Reading], dict[date, Decimal]], timeframe: Timeframe
+) -> None:
+    # A full rebuild may take the NumPy path, recalculating every bucket goes through GROUP BY
+    update_rollups(session=session, model=Rainfall, datestamps=readings[Rainfall])
+    for aggregation in Aggregation:
+        expected = get_reference(
+            readings=readings[Rainfall],
+            timeframe=timeframe,
+            aggregation=aggregation,
+            year=None,
+            month=None,
+        )
+        assert (
+            list_rollup_values(
+                session=session,
+                model=Rainfall,
+                timeframe=timeframe,
+                aggregation=aggregation,
+                year=None,
+                month=None,
+            )
+            == expected
+        )
@@ -0,0 +1,52 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlmodel import Session
+
+from tests.test_aggregation import get_reference
+from weatherdan.aggregation import Aggregation
+from weatherdan.columnar import Columns, calculate_columnar_rollups
+from weatherdan.models import Reading
+from weatherdan.rollups import ROLLUP_MODELS, ROLLUP_TIMEFRAMES
+from weatherdan.timeframe import Timeframe
+
+pytest.importorskip("numpy")
+
+
+@pytest.mark.parametrize("model", ROLLUP_MODELS)
+@pytest.mark.parametrize("timeframe", ROLLUP_TIMEFRAMES)
+def test_columnar_matches_reference(
+    session: Session,
+    readings: dict[type[Reading], dict[date, Decimal]],
+    model: type[Reading],
+    timeframe: Timeframe,
+) -> None:
+    # Averages are rounded to 2 decimal places from the exact total, as utils does
+    columns = Columns.load(session=session, model=model)
+    rollups = calculate_columnar_rollups(columns=columns, timeframe=timeframe)
+    for aggregation in Aggregation:
+        results = []
+        for start, end, total, count, high, low in rollups:
+            value = {
+                Aggregation.TOTAL: total,
+                Aggregation.HIGH: high,
+                Aggregation.AVERAGE: round(total / count, 2),
+                Aggregation.LOW: low,
+            }[aggregation]
+            results.append((start, end, value) if timeframe == Timeframe.WEEKLY else (start, value))
+        expected = get_reference(
+            readings=readings[model],
+            timeframe=timeframe,
+            aggregation=aggregation,
+            year=None,
+            month=None,
+        )
+        assert sorted(results) == expected, aggregation
+
+
+def test_columns_overflow() -> None:
+    with pytest.raises(OverflowError):
+        Columns.from_values(
+            datestamps=[date(2024, 1, 1), date(2024, 1, 2)], values=[Decimal(2**62), Decimal(2**62)]
+        )
@@ -0,0 +1,123 @@
+from collections.abc import AsyncIterator, Callable, Iterator
+from datetime import date
+from pathlib import Path
+
+import pytest
+from sqlalchemy import AsyncAdaptedQueuePool, Engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import Session, SQLModel, create_engine
+
+from tests.conftest import generate_readings
+from weatherdan import database
+from weatherdan.aggregation import Aggregation
+from weatherdan.queries import upsert_readings
+from weatherdan.rollups import ROLLUP_MODELS, get_rollup_series, rebuild_rollups
+from weatherdan.samples import SAMPLE_TIMEFRAMES
+from weatherdan.timeframe import Timeframe
+
+
+@pytest.fixture()
+def database_path(tmp_path: Path) -> Path:
+    path = tmp_path / "weatherdan.sqlite"
+    engine = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        for model in ROLLUP_MODELS:
+            upsert_readings(
+                session=session,
+                model=model,
+                readings=generate_readings(model=model, start=date(2023, 1, 1), days=400),
+            )
+            rebuild_rollups(session=session, model=model)
+        session.commit()
+    engine.dispose()
+    return path
+
+
+@pytest.fixture()
+def sync_engine(database_path: Path) -> Iterator[Engine]:
+    engine = create_engine(f"sqlite:///{database_path}", connect_args={"check_same_thread": False})
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+async def async_engine(database_path: Path) -> AsyncIterator[AsyncEngine]:
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{database_path}", poolclass=AsyncAdaptedQueuePool, pool_size=2
+    )
+    yield engine
+    await engine.dispose()
+
+
+def list_queries() -> list[Callable[[Session], bytes]]:
+    return [
+        lambda session, model=model, timeframe=timeframe, aggregation=aggregation: (
+            get_rollup_series(
+                session=session,
+                model=model,
+                timeframe=timeframe,
+                aggregation=aggregation,
+                year=2023,
+                max_entries=0,
+            ).to_json()
+        )
+        for model in ROLLUP_MODELS
+        for timeframe in Timeframe
+        if timeframe not in SAMPLE_TIMEFRAMES
+        for aggregation in Aggregation
+    ]
+
+
+@pytest.mark.anyio()
+async def test_async_engine_matches_sync(
+    monkeypatch: pytest.MonkeyPatch, sync_engine: Engine, async_engine: AsyncEngine
+) -> None:
+    # run_session is what every read endpoint goes through, in either mode
+    monkeypatch.setattr(database, "read_engine", sync_engine)
+    monkeypatch.setattr(database, "async_engine", None)
+    expected = [await database.run_session(function=x) for x in list_queries()]
+    monkeypatch.setattr(database, "async_engine", async_engine)
+    results = [await database.run_session(function=x) for x in list_queries()]
+    assert results == expected
+    assert all(x != b"[]" for x in expected)
+
+
+def create_profiled_engine(url: str, read_only: bool = False) -> Engine:
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    database.listen_pragmas(sync_engine=engine, read_only=read_only)
+    return engine
+
+
+def test_sqlite_profile(database_path: Path) -> None:
+    writer = create_profiled_engine(url=f"sqlite:///{database_path}")
+    reader = create_profiled_engine(
+        url=f"sqlite:///{database_path.resolve().as_uri()}?mode=ro&uri=true", read_only=True
+    )
+    try:
+        with writer.connect() as connection:
+            pragmas = {
+                x: connection.execute(text(f"PRAGMA {x}")).scalar()
+                for x in ("journal_mode", "synchronous", "temp_store", "busy_timeout")
+            }
+        assert pragmas == {
+            "journal_mode": "wal",
+            "synchronous": 1,
+            "temp_store": 2,
+            "busy_timeout": 5000,
+        }
+
+        with writer.begin() as writing, reader.connect() as reading:
+            count = reading.execute(text("SELECT count(*) FROM wind")).scalar()
+            reading.commit()
+            # The read-only pool sees the last commit while a write transaction is open
+            writing.execute(text("DELETE FROM wind"))
+            assert reading.execute(text("SELECT count(*) FROM wind")).scalar() == count > 0
+            assert reading.execute(text("PRAGMA query_only")).scalar() == 1
+            with pytest.raises(OperationalError, match="readonly|query_only"):
+                reading.execute(text("DELETE FROM solar"))
+            writing.rollback()
+    finally:
+        writer.dispose()
+        reader.dispose()
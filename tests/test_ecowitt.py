@@ -0,0 +1,167 @@
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from time import monotonic
+
+import pytest
+from httpx import AsyncClient, ConnectError, MockTransport, ReadTimeout, Request, Response
+
+from weatherdan.ecowitt.cache import HistoryCache
+from weatherdan.ecowitt.category import Category
+from weatherdan.ecowitt.exceptions import AuthenticationError, ServiceError
+from weatherdan.ecowitt.limiter import TokenBucket
+from weatherdan.ecowitt.service import Ecowitt
+
+START = datetime(2024, 1, 1)
+END = datetime(2024, 1, 31)
+
+
+def create_service(
+    handler: Callable[[Request], Response], cache: HistoryCache | None = None
+) -> Ecowitt:
+    service = Ecowitt(application_key="application", api_key="api", cache=cache)
+    service._client = AsyncClient(transport=MockTransport(handler=handler))  # noqa: SLF001
+    return service
+
+
+def history_response(readings: dict[str, str]) -> Response:
+    data = {"rainfall": {"daily": {"unit": "mm", "list": readings}}} if readings else []
+    return Response(status_code=200, json={"code": 0, "msg": "success", "data": data})
+
+
+@pytest.mark.anyio()
+async def test_empty_history_window_isnt_cached(tmp_path: Path) -> None:
+    responses = [{}, {"1704067200": "1.5"}, {"1704067200": "9.9"}]
+    requests = []
+
+    def handler(request: Request) -> Response:
+        requests.append(request)
+        return history_response(readings=responses[len(requests) - 1])
+
+    service = create_service(handler=handler, cache=HistoryCache(folder=tmp_path))
+    for expected in ({}, {"1704067200": "1.5"}, {"1704067200": "1.5"}):
+        results = await service._get_history_window(  # noqa: SLF001
+            device="mac", categories=[Category.RAINFALL], start_date=START, end_date=END
+        )
+        assert results == {Category.RAINFALL: expected}
+    # The empty window was requested again, the window with data came from the cache
+    assert len(requests) == 2
+
+
+@pytest.mark.anyio()
+async def test_history_requests_every_category_per_window() -> None:
+    # Each window is one request for every category, answered with a reading at its start
+    requests = []
+
+    def handler(request: Request) -> Response:
+        requests.append(request)
+        timestamp = int(datetime.fromisoformat(request.url.params["start_date"]).timestamp())
+        data = {}
+        for value in request.url.params["call_back"].split(","):
+            category = Category(value)
+            data.setdefault(category.group_1, {})[category.group_2] = {
+                "unit": "mm",
+                "list": {str(timestamp): str(list(Category).index(category) + 1)},
+            }
+        return Response(status_code=200, json={"code": 0, "msg": "success", "data": data})
+
+    service = create_service(handler=handler)
+    service.limiter = TokenBucket(calls=100, period=1)
+    results = await service.get_all_history_readings(
+        device="mac", categories=list(Category), start_date=datetime.now() - timedelta(days=365)
+    )
+    # A year of 30 day windows, aligned to a fixed grid so the first may start earlier
+    assert 13 <= len(requests) <= 14
+    assert {x.url.params["call_back"] for x in requests} == {",".join(x.value for x in Category)}
+    starts = sorted(datetime.fromisoformat(x.url.params["start_date"]) for x in requests)
+    for index, category in enumerate(Category):
+        assert results[category] == {
+            datetime.fromtimestamp(x.timestamp(), tz=UTC).astimezone(): Decimal(index + 1)
+            for x in starts
+        }
+
+
+@pytest.mark.anyio()
+async def test_token_bucket_limits_calls() -> None:
+    # The first two calls use the full bucket, the next two wait 0.1s each for a token
+    limiter = TokenBucket(calls=2, period=0.2)
+    start = monotonic()
+    for _ in range(4):
+        await limiter.acquire()
+    assert 0.18 < monotonic() - start < 0.5
+
+
+@pytest.mark.anyio()
+async def test_requests_share_the_limiter() -> None:
+    service = create_service(handler=lambda _: history_response(readings={"1704067200": "1.5"}))
+    service.limiter = TokenBucket(calls=1, period=0.1)
+    start = monotonic()
+    for _ in range(3):
+        await service._get_request(endpoint="/device/history")  # noqa: SLF001
+    assert monotonic() - start > 0.18
+
+
+@pytest.mark.anyio()
+async def test_live_reading() -> None:
+    requests = []
+
+    def handler(request: Request) -> Response:
+        requests.append(request)
+        return Response(
+            status_code=200,
+            json={
+                "code": 0,
+                "msg": "success",
+                "data": {
+                    "rainfall": {"daily": {"time": "1704067200", "unit": "mm", "value": "2.4"}}
+                },
+            },
+        )
+
+    service = create_service(handler=handler)
+    reading = await service.get_live_reading(device="mac", category=Category.RAINFALL)
+    assert requests[0].url.params["call_back"] == "rainfall.daily"
+    assert reading.value == Decimal("2.4")
+    assert await service.get_live_reading(device="mac", category=Category.SOLAR) is None
+
+
+def raise_error(error: Exception) -> Callable[[Request], Response]:
+    def handler(request: Request) -> Response:  # noqa: ARG001
+        raise error
+
+    return handler
+
+
+@pytest.mark.anyio()
+@pytest.mark.parametrize(
+    ("handler", "message"),
+    [
+        (raise_error(error=ConnectError("refused")), "Unable to connect"),
+        (raise_error(error=ReadTimeout("slow")), "Server took too long to respond"),
+        (lambda _: Response(status_code=503, text="Unavailable"), "Unavailable"),
+        (lambda _: Response(status_code=200, text="<html>"), "Unable to parse response"),
+        (
+            lambda _: Response(status_code=200, json={"code": 40000, "msg": "Bad mac"}),
+            "40000 | Bad mac",
+        ),
+    ],
+)
+async def test_errors_raise_service_error(
+    handler: Callable[[Request], Response], message: str
+) -> None:
+    service = create_service(handler=handler)
+    with pytest.raises(ServiceError, match=message):
+        await service.get_history_readings(
+            device="mac", category=Category.RAINFALL, start_date=datetime.now()
+        )
+
+
+@pytest.mark.anyio()
+async def test_invalid_credentials() -> None:
+    service = create_service(
+        handler=lambda _: Response(status_code=200, json={"code": 40010, "msg": "Illegal key"})
+    )
+    with pytest.raises(AuthenticationError, match="Illegal key"):
+        await service.list_devices()
+    assert await service.test_credentials() is False
@@ -0,0 +1,67 @@
+from collections.abc import Iterator
+from io import StringIO
+
+import pytest
+from sqlalchemy import Engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from weatherdan import export
+from weatherdan.export import FileFormat, stream_export
+from weatherdan.importer import import_readings, read_rows
+from weatherdan.models import Rainfall, Reading
+from weatherdan.rollups import ROLLUP_MODELS
+
+
+@pytest.fixture()
+def target() -> Iterator[Session]:
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def list_tables(session: Session, model: type[Reading]) -> tuple[list[tuple], list[tuple]]:
+    rollup_model = ROLLUP_MODELS[model]
+    readings = [(x.datestamp, x.value) for x in session.exec(select(model)).all()]
+    rollups = [
+        (x.timeframe.value, x.start_datestamp, x.total, x.count, x.high, x.low)
+        for x in session.exec(select(rollup_model)).all()
+    ]
+    return sorted(readings), sorted(rollups)
+
+
+@pytest.mark.parametrize("file_format", list(FileFormat))
+@pytest.mark.parametrize("single", [False, True])
+@pytest.mark.usefixtures("readings")
+def test_export_import_round_trip(
+    monkeypatch: pytest.MonkeyPatch,
+    engine: Engine,
+    session: Session,
+    target: Session,
+    file_format: FileFormat,
+    single: bool,
+) -> None:
+    monkeypatch.setattr(export, "read_engine", engine)
+    models = [Rainfall] if single else list(ROLLUP_MODELS)
+    content = b"".join(stream_export(*models, export_format=file_format)).decode()
+    result = import_readings(
+        session=target,
+        rows=read_rows(file=StringIO(content), file_format=file_format),
+        columns={"value": Rainfall} if single else {x.__tablename__: x for x in models},
+        batch_size=250,
+    )
+    assert result.rows == len(content.splitlines()) - (file_format == FileFormat.CSV)
+    for model in models:
+        assert list_tables(session=target, model=model) == list_tables(session=session, model=model)
+
+
+def test_import_error_reports_committed_batches(target: Session) -> None:
+    rows = [{"datestamp": f"2024-01-{x:02}", "value": str(x)} for x in range(1, 8)]
+    rows.append({"datestamp": "2024-01-08", "value": "x"})
+    with pytest.raises(ValueError, match="row 8.*Value must be a number.*6 rows in 3 batches"):
+        import_readings(session=target, rows=rows, columns={"value": Rainfall}, batch_size=2)
+    assert len(list_tables(session=target, model=Rainfall)[0]) == 6
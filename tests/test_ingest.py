@@ -0,0 +1,85 @@
+import random
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlmodel import Session, select
+
+from weatherdan.ecowitt.category import Category
+from weatherdan.ecowitt.schemas import LiveReading
+from weatherdan.ingest import save_readings
+from weatherdan.models import Rainfall, Reading
+from weatherdan.queries import ConflictPolicy, upsert_readings
+from weatherdan.rollups import ROLLUP_MODELS, rebuild_rollups
+
+
+def generate_samples(start: datetime, days: int, seed: int) -> dict[datetime, Decimal]:
+    generator = random.Random(seed)
+    return {
+        start + timedelta(minutes=30 * x): Decimal(generator.randint(0, 9999)).scaleb(-2)
+        for x in range(days * 48)
+    }
+
+
+def list_values(session: Session, model: type[Reading]) -> dict[date, Decimal]:
+    return {x.datestamp: x.value for x in session.exec(select(model)).all()}
+
+
+def list_rollups(session: Session, model: type[Reading]) -> list[tuple]:
+    rollup_model = ROLLUP_MODELS[model]
+    return sorted(
+        (x.timeframe.value, x.start_datestamp, x.end_datestamp, x.total, x.count, x.high, x.low)
+        for x in session.exec(select(rollup_model)).all()
+    )
+
+
+@pytest.mark.parametrize("policy", list(ConflictPolicy))
+def test_upsert_matches_per_row(session: Session, policy: ConflictPolicy) -> None:
+    existing = {date(2024, 1, x): Decimal(x) for x in range(1, 11)}
+    incoming = {date(2024, 1, x): Decimal(10 - x).scaleb(-1) * 20 for x in range(5, 16)}
+    upsert_readings(session=session, model=Rainfall, readings=existing)
+    upsert_readings(session=session, model=Rainfall, readings=incoming, policy=policy)
+    session.commit()
+
+    expected = dict(existing)
+    for key, value in incoming.items():
+        if key not in expected or policy == ConflictPolicy.REPLACE:
+            expected[key] = value
+        elif policy == ConflictPolicy.KEEP_MAX:
+            expected[key] = max(expected[key], value)
+    assert list_values(session=session, model=Rainfall) == expected
+
+
+def test_refreshes_match_per_row(session: Session) -> None:
+    # Two refreshes overlapping by a few days, then a live reading, as a per-row loop would keep
+    start = datetime(2024, 2, 20, 0, 0).astimezone()
+    first = generate_samples(start=start, days=20, seed=1)
+    second = generate_samples(start=start + timedelta(days=17), days=30, seed=2)
+    # Ecowitt revised the overlapping samples down, every overlapping day's high drops
+    second.update({x: (first[x] / 2).quantize(Decimal("0.01")) for x in first if x in second})
+    refreshes = [first, second]
+    live = LiveReading(time=start + timedelta(days=46, hours=1), unit="mm", value=Decimal(150))
+    # Samples are stored per timestamp, so the second refresh replaces the overlap
+    expected = {}
+    for timestamp, value in {**first, **second}.items():
+        expected[timestamp.date()] = max(expected.get(timestamp.date(), value), value)
+    expected[live.time.date()] = max(expected[live.time.date()], live.value)
+    overlap = {x.date() for x in first if x in second}
+    assert len(overlap) == 3
+    assert all(expected[x] < max(y for z, y in first.items() if z.date() == x) for x in overlap)
+
+    for index, samples in enumerate(refreshes):
+        save_readings(
+            session=session,
+            category=Category.RAINFALL,
+            device="mac",
+            history_readings=samples,
+            live_reading=live if index else None,
+        )
+        session.commit()
+    assert list_values(session=session, model=Rainfall) == expected
+
+    # Rollups updated per refresh match a rebuild from scratch
+    updated = list_rollups(session=session, model=Rainfall)
+    rebuild_rollups(session=session, model=Rainfall)
+    assert updated == list_rollups(session=session, model=Rainfall)
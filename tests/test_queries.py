@@ -0,0 +1,34 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from pydantic import TypeAdapter
+from sqlmodel import Session, select
+
+from weatherdan import utils
+from weatherdan.models import Rainfall, Reading
+from weatherdan.queries import get_daily_series
+from weatherdan.series import Layout
+
+ADAPTER = TypeAdapter(list[Reading])
+
+
+@pytest.mark.parametrize(
+    ("year", "month"), [(None, None), (2023, None), (2024, 2), (2024, None), (None, 3), (2019, 5)]
+)
+@pytest.mark.parametrize("max_entries", [0, 1, 28, 400])
+def test_daily_matches_full_scan(
+    session: Session,
+    readings: dict[type[Reading], dict[date, Decimal]],
+    year: int | None,
+    month: int | None,
+    max_entries: int,
+) -> None:
+    # The endpoints used to load every row, filter in Python and keep the last max-entries
+    entries = sorted(session.exec(select(Rainfall)).all())
+    assert len(entries) == len(readings[Rainfall])
+    expected = utils.get_daily_readings(entries=entries, year=year, month=month)[-max_entries:]
+    series = get_daily_series(
+        session=session, model=Rainfall, year=year, month=month, max_entries=max_entries
+    )
+    assert series.to_json(layout=Layout.ROWS) == ADAPTER.dump_json(expected)
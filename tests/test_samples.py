@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlmodel import Session
+
+from weatherdan.ecowitt.category import Category
+from weatherdan.samples import get_sample_series, list_sample_graph, upsert_samples
+from weatherdan.timeframe import Timeframe
+
+
+def add_samples(session: Session, start: datetime, count: int, step: timedelta) -> None:
+    upsert_samples(
+        session=session,
+        category=Category.SOLAR,
+        device="mac",
+        readings={start + step * x: Decimal(x % 97) for x in range(count)},
+    )
+    session.commit()
+
+
+@pytest.mark.parametrize("timezone", ["UTC", "Australia/Adelaide"], indirect=True)
+@pytest.mark.usefixtures("timezone")
+def test_month_without_year(session: Session) -> None:
+    add_samples(
+        session=session, start=datetime(2023, 1, 1).astimezone(), count=800, step=timedelta(days=1)
+    )
+    series = get_sample_series(
+        session=session, category=Category.SOLAR, timeframe=Timeframe.RAW, month=2, max_entries=0
+    )
+    readings = series.to_readings()
+    assert len(readings) == 28 + 29 + 28
+    assert {(x.timestamp.year, x.timestamp.month) for x in readings} == {
+        (2023, 2),
+        (2024, 2),
+        (2025, 2),
+    }
+    assert not get_sample_series(
+        session=session, category=Category.SOLAR, timeframe=Timeframe.RAW, month=13
+    ).to_readings()
+
+
+@pytest.mark.parametrize("timezone", ["UTC", "Asia/Kolkata", "Australia/Adelaide"], indirect=True)
+@pytest.mark.usefixtures("timezone")
+def test_hours_start_on_local_hours(session: Session) -> None:
+    add_samples(
+        session=session,
+        start=datetime(2024, 1, 1).astimezone(),
+        count=96,
+        step=timedelta(minutes=30),
+    )
+    graph = list_sample_graph(
+        session=session, category=Category.SOLAR, timeframe=Timeframe.HOURLY, max_entries=0
+    )
+    assert len(graph.total) == 48
+    assert all(x.timestamp.minute == 0 for x in graph.total)
+    assert graph.total[0].timestamp == datetime(2024, 1, 1).astimezone()
+    assert graph.total[0].value == Decimal(1)
+
+
+def test_points_cover_the_whole_range(session: Session) -> None:
+    start = datetime(2024, 1, 1).astimezone()
+    add_samples(session=session, start=start, count=500, step=timedelta(minutes=5))
+    series = get_sample_series(
+        session=session, category=Category.SOLAR, timeframe=Timeframe.RAW, max_entries=28, points=50
+    )
+    readings = series.to_readings()
+    assert len(readings) == 50
+    assert readings[0].timestamp == start
+    assert readings[-1].timestamp == start + timedelta(minutes=5 * 499)
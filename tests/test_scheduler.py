@@ -0,0 +1,34 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from weatherdan.constants import constants
+from weatherdan.ecowitt.category import Category
+from weatherdan.scheduler import JobStatus, RefreshJob, Scheduler
+
+
+async def wait_for(job: RefreshJob) -> RefreshJob:
+    while job.finished is None:
+        await asyncio.sleep(0.01)
+    return job
+
+
+@pytest.mark.anyio()
+async def test_missing_credentials_fail_the_job(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Default settings on a fresh install, every category is stale and there are no credentials
+    monkeypatch.setattr(constants.settings.ecowitt, "refresh_interval", 180)
+    scheduler = Scheduler(interval=timedelta(minutes=180))
+    scheduler.start()
+    try:
+        job = await asyncio.wait_for(wait_for(job=scheduler.get_job(job_id=1)), timeout=5)
+        assert job.status == JobStatus.FAILED
+        assert job.error == "Missing Ecowitt credential: application_key"
+
+        # The consumer task survives and keeps processing jobs
+        job = scheduler.enqueue(categories=[Category.RAINFALL], force=True)
+        job = await asyncio.wait_for(wait_for(job=job), timeout=5)
+        assert job.status == JobStatus.FAILED
+        assert not scheduler._task.done()  # noqa: SLF001
+    finally:
+        await scheduler.stop()
@@ -0,0 +1,69 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from pydantic import TypeAdapter
+from sqlmodel import Session
+
+from weatherdan.aggregation import Aggregation
+from weatherdan.models import Rainfall, Reading, ReadingColumns, SampleReading, WeekReading
+from weatherdan.rollups import ROLLUP_TIMEFRAMES, get_rollup_series, list_rollups, to_rollup_reading
+from weatherdan.series import Layout, SampleSeries, Series
+from weatherdan.timeframe import Timeframe
+
+VALUES = [Decimal("0"), Decimal("1.50"), Decimal("12345678901234.5678"), Decimal("0.1")]
+
+
+def create_series(kind: str) -> Series | SampleSeries:
+    # Built per test, rendered JSON is kept on the series
+    if kind == "daily":
+        return Series.from_rows(rows=((date(2024, 1, x + 1), y) for x, y in enumerate(VALUES)))
+    if kind == "weekly":
+        return Series.from_week_rows(
+            rows=(
+                (date(2024, 1, 7 * x + 1), date(2024, 1, 7 * x + 7), y)
+                for x, y in enumerate(VALUES)
+            )
+        )
+    return SampleSeries.from_rows(
+        rows=((int(datetime(2024, 1, 1, x).timestamp()), y) for x, y in enumerate(VALUES))
+    )
+
+
+KINDS = ["daily", "weekly", "samples"]
+ADAPTER = TypeAdapter(list[Reading | WeekReading | SampleReading])
+
+
+@pytest.mark.parametrize("kind", KINDS)
+def test_columns_match_rows(kind: str) -> None:
+    series = create_series(kind=kind)
+    rows = json.loads(series.to_json(layout=Layout.ROWS))
+    columns = json.loads(series.to_json(layout=Layout.COLUMNS))
+    assert columns["values"] == [x["value"] for x in rows]
+    assert ReadingColumns.model_validate(columns).model_dump()["values"] == VALUES
+
+
+@pytest.mark.parametrize("timezone", ["UTC", "Asia/Kolkata"], indirect=True)
+@pytest.mark.parametrize("kind", KINDS)
+@pytest.mark.usefixtures("timezone")
+def test_rows_match_pydantic(kind: str) -> None:
+    series = create_series(kind=kind)
+    assert series.to_json(layout=Layout.ROWS) == ADAPTER.dump_json(series.to_readings())
+
+
+@pytest.mark.parametrize("timeframe", ROLLUP_TIMEFRAMES)
+@pytest.mark.parametrize("aggregation", list(Aggregation))
+@pytest.mark.usefixtures("readings")
+def test_rollup_series_match_models(
+    session: Session, timeframe: Timeframe, aggregation: Aggregation
+) -> None:
+    # Byte for byte what serialising a list of Reading/WeekReading models gives
+    series = get_rollup_series(
+        session=session, model=Rainfall, timeframe=timeframe, aggregation=aggregation, max_entries=0
+    )
+    readings = [
+        to_rollup_reading(rollup=x, timeframe=timeframe, aggregation=aggregation)
+        for x in list_rollups(session=session, model=Rainfall, timeframe=timeframe, max_entries=0)
+    ]
+    assert series.to_json(layout=Layout.ROWS) == ADAPTER.dump_json(readings)
@@ -0,0 +1,255 @@
+from collections.abc import Iterator
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from sqlalchemy import Engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, func, select
+
+from tests.conftest import generate_readings
+from weatherdan import database, export, queries, storage
+from weatherdan.aggregation import Aggregation
+from weatherdan.database import convert_tables, set_fixed_point
+from weatherdan.export import FileFormat, stream_export
+from weatherdan.models import MetricReading, Rainfall, Reading, ScaledDecimal, UVIndex
+from weatherdan.queries import get_daily_series, upsert_readings
+from weatherdan.rollups import (
+    ROLLUP_MODELS,
+    get_rollup_series,
+    list_months,
+    list_years,
+    rebuild_rollups,
+    update_rollups,
+)
+from weatherdan.samples import SAMPLE_TIMEFRAMES
+from weatherdan.storage import copy_readings, get_reading, list_unconverted, save_reading
+from weatherdan.timeframe import Timeframe
+
+FILTERS = [(None, None), (2023, None), (2024, 2), (None, 6)]
+
+
+def set_unified(monkeypatch: pytest.MonkeyPatch, enabled: bool) -> None:
+    # Read once at import by each module that branches on it
+    for module in (storage, queries, export):
+        monkeypatch.setattr(module, "UNIFIED_READINGS", enabled)
+
+
+@pytest.fixture(params=[False, True], ids=["decimal", "fixed_point"])
+def fixed_point(request: pytest.FixtureRequest) -> Iterator[bool]:
+    set_fixed_point(enabled=request.param)
+    yield request.param
+    set_fixed_point(enabled=False)
+
+
+@pytest.fixture()
+def engine(fixed_point: bool) -> Iterator[Engine]:  # noqa: ARG001
+    # An engine keeps the value handling it first used, so each is created after the switch
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def list_values(session: Session, model: type[Reading]) -> list[tuple[date, Decimal]]:
+    series = get_daily_series(session=session, model=model, max_entries=0)
+    return [(x.datestamp, x.value) for x in series.to_readings()]
+
+
+def run_scenario(session: Session) -> list:
+    for model in ROLLUP_MODELS:
+        upsert_readings(
+            session=session,
+            model=model,
+            readings=generate_readings(model=model, start=date(2022, 12, 28), days=800),
+        )
+        rebuild_rollups(session=session, model=model)
+    reading = save_reading(
+        session=session, model=Rainfall, reading=Reading(datestamp=date(2023, 6, 1), value=99)
+    )
+    session.delete(get_reading(session=session, model=Rainfall, datestamp=date(2023, 6, 2)))
+    update_rollups(
+        session=session, model=Rainfall, datestamps=[reading.datestamp, date(2023, 6, 2)]
+    )
+    session.commit()
+
+    results = [
+        b"".join(stream_export(*ROLLUP_MODELS, export_format=FileFormat.CSV)),
+        str(get_reading(session=session, model=UVIndex, datestamp=date(2023, 6, 1)).value),
+    ]
+    for model in ROLLUP_MODELS:
+        results.append(b"".join(stream_export(model, export_format=FileFormat.NDJSON)))
+        results.append(
+            (
+                list_years(session=session, model=model),
+                list_months(session=session, model=model, year=2023),
+            )
+        )
+        for timeframe in Timeframe:
+            if timeframe in SAMPLE_TIMEFRAMES:
+                continue
+            for aggregation in Aggregation:
+                for year, month in FILTERS:
+                    series = get_rollup_series(
+                        session=session,
+                        model=model,
+                        timeframe=timeframe,
+                        aggregation=aggregation,
+                        year=year,
+                        month=month,
+                        max_entries=0,
+                    )
+                    results.append(series.to_json())
+    return results
+
+
+@pytest.mark.usefixtures("fixed_point")
+def test_unified_matches_per_table(
+    monkeypatch: pytest.MonkeyPatch, engine: Engine, session: Session
+) -> None:
+    # Each metric reads back with its own decimal places from the shared column too
+    monkeypatch.setattr(export, "read_engine", engine)
+    expected = run_scenario(session=session)
+    assert session.exec(select(func.count()).select_from(MetricReading)).one() == 0
+
+    for model in ROLLUP_MODELS:
+        session.exec(model.__table__.delete())
+        session.exec(ROLLUP_MODELS[model].__table__.delete())
+    session.commit()
+    set_unified(monkeypatch=monkeypatch, enabled=True)
+    results = run_scenario(session=session)
+    assert session.exec(select(func.count()).select_from(Rainfall)).one() == 0
+    assert session.exec(select(func.count()).select_from(MetricReading)).one() > 0
+    assert results == expected
+    assert not list_unconverted(session=session, tables=SQLModel.metadata.sorted_tables)
+    assert get_reading(
+        session=session, model=Rainfall, datestamp=date(2023, 6, 1)
+    ).value == Decimal(99)
+
+
+def test_to_scaled_refuses_values_that_dont_fit() -> None:
+    value_type = ScaledDecimal(scale=1, fixed_point=True)
+    assert value_type.to_scaled(value=Decimal("12.30")) == 123
+    with pytest.raises(ValueError, match="finer than the stored precision of 0.1"):
+        value_type.to_scaled(value=Decimal("12.34"))
+    with pytest.raises(ValueError, match="too large to store as a 64-bit integer"):
+        value_type.to_scaled(value=Decimal(2**63))
+
+
+@pytest.mark.usefixtures("fixed_point")
+def test_copy_readings_round_trip(monkeypatch: pytest.MonkeyPatch, session: Session) -> None:
+    for model in ROLLUP_MODELS:
+        upsert_readings(
+            session=session,
+            model=model,
+            readings=generate_readings(model=model, start=date(2023, 1, 1), days=100),
+        )
+    session.commit()
+    expected = {x: list_values(session=session, model=x) for x in ROLLUP_MODELS}
+
+    # Fixed point integers are rescaled between each metric's places and the unified column's
+    for model in ROLLUP_MODELS:
+        copy_readings(session=session, model=model)
+        session.exec(model.__table__.delete())
+    session.commit()
+    set_unified(monkeypatch=monkeypatch, enabled=True)
+    assert {x: list_values(session=session, model=x) for x in ROLLUP_MODELS} == expected
+
+    for model in ROLLUP_MODELS:
+        copy_readings(session=session, model=model, reverse=True)
+    session.exec(MetricReading.__table__.delete())
+    session.commit()
+    set_unified(monkeypatch=monkeypatch, enabled=False)
+    assert {x: list_values(session=session, model=x) for x in ROLLUP_MODELS} == expected
+
+
+def list_rollups(session: Session, model: type[Reading]) -> list[tuple]:
+    return sorted(
+        (x.timeframe.value, x.start_datestamp, x.total, x.count, x.high, x.low)
+        for x in session.exec(select(ROLLUP_MODELS[model])).all()
+    )
+
+
+def list_tables(path: Path) -> dict[type[Reading], tuple[list, list]]:
+    # A new engine each time, as the value handling changes with the setting
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        with Session(engine) as session:
+            assert not list_unconverted(session=session, tables=SQLModel.metadata.sorted_tables)
+            return {
+                x: (list_values(session=session, model=x), list_rollups(session=session, model=x))
+                for x in ROLLUP_MODELS
+            }
+    finally:
+        engine.dispose()
+
+
+@pytest.mark.parametrize("unified", [False, True])
+def test_convert_tables(monkeypatch: pytest.MonkeyPatch, tmp_path: Path, unified: bool) -> None:
+    # migrate-values against a database file, from decimals to fixed point
+    path = tmp_path / "weatherdan.sqlite"
+    monkeypatch.setattr(database.database_settings, "database_name", str(path))
+    set_unified(monkeypatch=monkeypatch, enabled=unified)
+    set_fixed_point(enabled=False)
+    engine = create_engine(f"sqlite:///{path}")
+    with Session(engine) as session:
+        SQLModel.metadata.create_all(engine)
+        for model in ROLLUP_MODELS:
+            upsert_readings(
+                session=session,
+                model=model,
+                readings=generate_readings(model=model, start=date(2023, 1, 1), days=100),
+            )
+            rebuild_rollups(session=session, model=model)
+        session.commit()
+    engine.dispose()
+    expected = list_tables(path=path)
+    try:
+        set_fixed_point(enabled=True)
+        converted = convert_tables()
+        # Both storage layouts are converted, the unused one is empty
+        assert converted[MetricReading.__tablename__] + sum(
+            converted[x.__tablename__] for x in ROLLUP_MODELS
+        ) == sum(len(x) for x, _ in expected.values())
+        assert {x: converted[y.__tablename__] for x, y in ROLLUP_MODELS.items()} == {
+            x: len(y) for x, (_, y) in expected.items()
+        }
+        assert list_tables(path=path) == expected
+    finally:
+        set_fixed_point(enabled=False)
+
+
+@pytest.mark.parametrize("unified", [False, True])
+def test_convert_tables_refuses_finer_values(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, unified: bool
+) -> None:
+    path = tmp_path / "weatherdan.sqlite"
+    monkeypatch.setattr(database.database_settings, "database_name", str(path))
+    set_unified(monkeypatch=monkeypatch, enabled=unified)
+    set_fixed_point(enabled=False)
+    engine = create_engine(f"sqlite:///{path}")
+    with Session(engine) as session:
+        SQLModel.metadata.create_all(engine)
+        # A UV index is kept to whole numbers, even in the unified table's finer column
+        save_reading(
+            session=session,
+            model=UVIndex,
+            reading=Reading(datestamp=date(2024, 1, 1), value=Decimal("3.5")),
+        )
+        rebuild_rollups(session=session, model=UVIndex)
+        session.commit()
+    engine.dispose()
+    expected = list_tables(path=path)
+    try:
+        set_fixed_point(enabled=True)
+        with pytest.raises(
+            ValueError, match=r"uv_index.*3\.50* is finer than the stored precision of 1$"
+        ):
+            convert_tables()
+    finally:
+        set_fixed_point(enabled=False)
+    # Nothing was converted, so the database still opens with decimals
+    assert list_tables(path=path) == expected
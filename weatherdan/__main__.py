@@ -1,5 +1,7 @@
 import logging
-from datetime import datetime
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
 from http import HTTPStatus
 
 from fastapi import FastAPI, Request
@@ -9,18 +11,33 @@
 
 from weatherdan import __version__, elapsed_timer, get_project_root, setup_logging
 from weatherdan.constants import constants
-from weatherdan.database import create_db_and_tables
+from weatherdan.database import async_engine, create_db_and_tables
 from weatherdan.routers.api import router as api_router
 from weatherdan.routers.html import router as html_router
+from weatherdan.scheduler import Scheduler
 
 LOGGER = logging.getLogger("weatherdan")
 
 
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    _app.state.scheduler.start()
+    yield
+    await _app.state.scheduler.stop()
+    if "ecowitt" in vars(constants):
+        await constants.ecowitt.close()
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
 def create_app() -> FastAPI:
-    _app = FastAPI(title="Weatherdan", version=__version__)
+    _app = FastAPI(title="Weatherdan", version=__version__, lifespan=lifespan)
     _app.mount("/static", StaticFiles(directory=get_project_root() / "static"), name="static")
     _app.include_router(html_router)
     _app.include_router(api_router)
+    _app.state.scheduler = Scheduler(
+        interval=timedelta(minutes=constants.settings.ecowitt.refresh_interval)
+    )
 
     setup_logging()
     create_db_and_tables()
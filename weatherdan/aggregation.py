@@ -0,0 +1,37 @@
+__all__ = ["Aggregation", "get_bucket", "get_week_range"]
+
+from datetime import date, timedelta
+from enum import Enum
+
+from sqlalchemy import ColumnElement, Date, cast, func, literal_column, type_coerce
+
+from weatherdan.queries import get_date_range
+from weatherdan.timeframe import Timeframe
+from weatherdan.utils import get_week_ends
+
+
+class Aggregation(Enum):
+    TOTAL = "Total"
+    HIGH = "High"
+    AVERAGE = "Average"
+    LOW = "Low"
+
+
+def get_bucket(dialect: str, timeframe: Timeframe, column: ColumnElement) -> ColumnElement:
+    if dialect == "postgresql":
+        unit = {Timeframe.WEEKLY: "week", Timeframe.MONTHLY: "month", Timeframe.YEARLY: "year"}
+        return cast(func.date_trunc(literal_column(f"'{unit[timeframe]}'"), column), Date)
+    modifiers = {
+        Timeframe.WEEKLY: ("weekday 0", "-6 days"),
+        Timeframe.MONTHLY: ("start of month",),
+        Timeframe.YEARLY: ("start of year",),
+    }
+    return type_coerce(func.date(column, *modifiers[timeframe]), Date)
+
+
+def get_week_range(year: int) -> tuple[date, date] | None:
+    if not (year_range := get_date_range(year=year)):
+        return None
+    start, _ = get_week_ends(value=year_range[0])
+    _, end = get_week_ends(value=year_range[1] - timedelta(days=1))
+    return start, end + timedelta(days=1)
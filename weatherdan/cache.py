@@ -0,0 +1,79 @@
+__all__ = ["CacheStats", "ReadingsCache"]
+
+from collections import Counter, OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from datetime import UTC, datetime
+from threading import Lock
+from typing import Any, Self
+
+from pydantic import BaseModel
+
+
+class CacheStats(BaseModel):
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+
+
+class ReadingsCache:
+    def __init__(self: Self, max_size: int = 256):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[Hashable, ...], Any] = OrderedDict()
+        self._generations: Counter[str] = Counter()
+        self._modified: dict[str, datetime] = {}
+        self._lock = Lock()
+        self.started = datetime.now(tz=UTC)
+
+    @property
+    def stats(self: Self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self.hits, misses=self.misses, size=len(self._entries), max_size=self.max_size
+            )
+
+    def _lookup(self: Self, key: tuple[Hashable, ...]) -> tuple[bool, Any, int]:
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return True, self._entries[key], self._generations[key[0]]
+            self.misses += 1
+            return False, None, self._generations[key[0]]
+
+    def _store(self: Self, key: tuple[Hashable, ...], generation: int, value: Any) -> None:  # noqa: ANN401
+        with self._lock:
+            # Skip storing if the table was written to while the value was being created
+            if self._generations[key[0]] == generation and self.max_size > 0:
+                self._entries[key] = value
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+
+    def get_or_create(self: Self, key: tuple[Hashable, ...], factory: Callable[[], Any]) -> Any:  # noqa: ANN401
+        found, value, generation = self._lookup(key=key)
+        if not found:
+            value = factory()
+            self._store(key=key, generation=generation, value=value)
+        return value
+
+    async def get_or_create_async(
+        self: Self, key: tuple[Hashable, ...], factory: Callable[[], Awaitable[Any]]
+    ) -> Any:  # noqa: ANN401
+        found, value, generation = self._lookup(key=key)
+        if not found:
+            value = await factory()
+            self._store(key=key, generation=generation, value=value)
+        return value
+
+    def get_version(self: Self, table: str) -> tuple[int, datetime]:
+        with self._lock:
+            return self._generations[table], self._modified.get(table, self.started)
+
+    def invalidate(self: Self, table: str) -> None:
+        with self._lock:
+            self._generations[table] += 1
+            self._modified[table] = datetime.now(tz=UTC)
+            for key in [x for x in self._entries if x[0] == table]:
+                del self._entries[key]
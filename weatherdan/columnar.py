@@ -0,0 +1,121 @@
+__all__ = ["Columns", "calculate_columnar_rollups", "is_available"]
+
+from datetime import date
+from decimal import Decimal
+from typing import Self
+
+from sqlalchemy import BigInteger, type_coerce
+from sqlmodel import Session, select
+
+from weatherdan.models import Reading
+from weatherdan.storage import get_source
+from weatherdan.timeframe import Timeframe
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+INT64_MAX = 2**63 - 1
+
+
+def is_available() -> bool:
+    return np is not None
+
+
+class Columns:
+    def __init__(self: Self, datestamps: list[date], scaled: list[int], scale: int):
+        self.scale = scale
+        if scaled and max(abs(x) for x in scaled) * len(scaled) > INT64_MAX:
+            msg = "Values are too large to aggregate as 64-bit integers"
+            raise OverflowError(msg)
+        self.datestamps = np.array(datestamps, dtype="datetime64[D]")
+        self.scaled = np.array(scaled, dtype=np.int64)
+        order = np.argsort(self.datestamps, kind="stable")
+        self.datestamps = self.datestamps[order]
+        self.scaled = self.scaled[order]
+
+    def __len__(self: Self) -> int:
+        return len(self.scaled)
+
+    @classmethod
+    def from_values(cls: type[Self], datestamps: list[date], values: list[Decimal]) -> Self:
+        # Store values as integers scaled by the most decimal places in use so sums stay exact
+        scale = max((-min(x.normalize().as_tuple().exponent, 0) for x in values), default=0)
+        return cls(
+            datestamps=datestamps, scaled=[int(x.scaleb(scale)) for x in values], scale=scale
+        )
+
+    @classmethod
+    def load(cls: type[Self], session: Session, model: type[Reading]) -> Self:
+        source = get_source(model=model)
+        if (value_type := source.value.type).fixed_point:
+            # Already stored as scaled integers, so they're read as is
+            statement = select(source.datestamp, type_coerce(source.value, BigInteger))
+            rows = session.exec(statement).all()
+            return cls(
+                datestamps=[x for x, _ in rows], scaled=[x for _, x in rows], scale=value_type.scale
+            )
+        rows = session.exec(select(source.datestamp, source.value)).all()
+        return cls.from_values(datestamps=[x for x, _ in rows], values=[x for _, x in rows])
+
+    def to_decimal(self: Self, value: int) -> Decimal:
+        return Decimal(int(value)).scaleb(-self.scale)
+
+
+def get_bucket_starts(datestamps: "np.ndarray", timeframe: Timeframe) -> "np.ndarray":
+    if timeframe == Timeframe.WEEKLY:
+        # 1970-01-01 was a Thursday, shift so buckets start on Monday
+        days = datestamps.astype(np.int64)
+        return (days - (days + 3) % 7).astype("datetime64[D]")
+    unit = "datetime64[M]" if timeframe == Timeframe.MONTHLY else "datetime64[Y]"
+    return datestamps.astype(unit).astype("datetime64[D]")
+
+
+def get_bucket_ends(starts: "np.ndarray", timeframe: Timeframe) -> "np.ndarray":
+    if timeframe == Timeframe.WEEKLY:
+        return starts + 6
+    unit = "datetime64[M]" if timeframe == Timeframe.MONTHLY else "datetime64[Y]"
+    return (starts.astype(unit) + 1).astype("datetime64[D]") - 1
+
+
+def reduce_columns(
+    columns: Columns, timeframe: Timeframe
+) -> tuple["np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray"]:
+    buckets = get_bucket_starts(datestamps=columns.datestamps, timeframe=timeframe)
+    starts, indices, counts = np.unique(buckets, return_index=True, return_counts=True)
+    if not len(columns):
+        return starts, columns.scaled, counts, columns.scaled, columns.scaled
+    return (
+        starts,
+        np.add.reduceat(columns.scaled, indices),
+        counts,
+        np.maximum.reduceat(columns.scaled, indices),
+        np.minimum.reduceat(columns.scaled, indices),
+    )
+
+
+def calculate_columnar_rollups(
+    columns: Columns, timeframe: Timeframe
+) -> list[tuple[date, date, Decimal, int, Decimal, Decimal]]:
+    starts, totals, counts, highs, lows = reduce_columns(columns=columns, timeframe=timeframe)
+    ends = get_bucket_ends(starts=starts, timeframe=timeframe)
+    return [
+        (
+            start,
+            end,
+            columns.to_decimal(value=total),
+            count,
+            columns.to_decimal(value=high),
+            columns.to_decimal(value=low),
+        )
+        for start, end, total, count, high, low in zip(
+            starts.tolist(),
+            ends.tolist(),
+            totals.tolist(),
+            counts.tolist(),
+            highs.tolist(),
+            lows.tolist(),
+            strict=True,
+        )
+    ]
@@ -1,10 +1,13 @@
 __all__ = ["constants"]
 
 import logging
-import sys
 from functools import cached_property
 from typing import Self
 
+from weatherdan import get_cache_root
+from weatherdan.cache import ReadingsCache
+from weatherdan.ecowitt.cache import HistoryCache
+from weatherdan.ecowitt.exceptions import ServiceError
 from weatherdan.ecowitt.service import Ecowitt
 from weatherdan.settings import Settings
 
@@ -18,17 +21,20 @@ def settings(self: Self) -> Settings:
 
     @cached_property
     def ecowitt(self: Self) -> Ecowitt:
-        if not self.settings.ecowitt.application_key:
-            sys.exit("Missing Ecowitt credential: application_key")
-        if not self.settings.ecowitt.api_key:
-            sys.exit("Missing Ecowitt credential: api_key")
-        ecowitt = Ecowitt(
+        # Raised rather than exiting, refreshes run in a background task and fail as a job
+        for name in ("application_key", "api_key"):
+            if not getattr(self.settings.ecowitt, name):
+                msg = f"Missing Ecowitt credential: {name}"
+                raise ServiceError(msg)
+        return Ecowitt(
             application_key=self.settings.ecowitt.application_key,
             api_key=self.settings.ecowitt.api_key,
+            cache=HistoryCache(folder=get_cache_root() / "history"),
         )
-        if not ecowitt.test_credentials():
-            sys.exit("Invalid Ecowitt credentials")
-        return ecowitt
+
+    @cached_property
+    def readings_cache(self: Self) -> ReadingsCache:
+        return ReadingsCache(max_size=self.settings.website.cache_size)
 
 
 constants = Constants()
@@ -1,20 +1,197 @@
-__all__ = ["create_db_and_tables", "get_session"]
+__all__ = [
+    "async_engine",
+    "convert_tables",
+    "create_db_and_tables",
+    "engine",
+    "get_read_session",
+    "get_session",
+    "read_engine",
+    "run_session",
+    "set_fixed_point",
+]
 
-from sqlmodel import Session, SQLModel, create_engine
+import logging
+import sys
+from collections.abc import Callable
+from functools import partial
+from typing import Any, TypeVar
+
+from sqlalchemy import AsyncAdaptedQueuePool, Connection, Engine, event, func
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, SQLModel, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from weatherdan.constants import constants
+from weatherdan.models import MetricReading, ScaledDecimal
+from weatherdan.rollups import ROLLUP_MODELS, rebuild_rollups
 from weatherdan.settings import Source
+from weatherdan.storage import (
+    UNIFIED_READINGS,
+    convert_values,
+    copy_readings,
+    get_source,
+    get_view,
+    list_unconverted,
+)
+
+LOGGER = logging.getLogger(__name__)
+T = TypeVar("T")
+
+database_settings = constants.settings.database
+pool_args = {
+    "pool_size": database_settings.pool_size,
+    "max_overflow": database_settings.max_overflow,
+    "pool_pre_ping": database_settings.pool_pre_ping,
+    "pool_recycle": database_settings.pool_recycle,
+}
+is_sqlite = database_settings.source == Source.SQLITE
+connect_args = {"check_same_thread": False} if is_sqlite else {}
+
+
+def set_fixed_point(enabled: bool) -> None:
+    # The models declare how many decimal places each value keeps, how they're stored is a
+    # setting. Switched before any statement is compiled
+    for table in SQLModel.metadata.tables.values():
+        for column in table.columns:
+            if isinstance(column.type, ScaledDecimal):
+                column.type.fixed_point = enabled
+    # The unified views carry their own copy of the value type
+    get_view.cache_clear()
+
 
-connect_args = (
-    {"check_same_thread": False} if constants.settings.database.source == Source.SQLITE else {}
+set_fixed_point(enabled=database_settings.fixed_point)
+
+
+def apply_pragmas(dbapi_connection: Any, _: Any, read_only: bool = False) -> None:  # noqa: ANN401
+    profile = database_settings.sqlite
+    pragmas = {
+        "busy_timeout": profile.busy_timeout,
+        "cache_size": profile.cache_size,
+        "mmap_size": profile.mmap_size,
+        "temp_store": profile.temp_store,
+    }
+    if read_only:
+        pragmas["query_only"] = "ON"
+    else:
+        # journal_mode is stored in the database file, so only writers set it
+        pragmas["journal_mode"] = profile.journal_mode
+        pragmas["synchronous"] = profile.synchronous
+    cursor = dbapi_connection.cursor()
+    for key, value in pragmas.items():
+        cursor.execute(f"PRAGMA {key} = {value}")
+    cursor.close()
+
+
+def listen_pragmas(sync_engine: Engine, read_only: bool = False) -> None:
+    if is_sqlite:
+        event.listen(sync_engine, "connect", partial(apply_pragmas, read_only=read_only))
+
+
+engine = create_engine(database_settings.db_url, echo=False, connect_args=connect_args, **pool_args)
+listen_pragmas(sync_engine=engine)
+# GET routes read through their own pool, opened read-only on SQLite so readers never queue
+# behind the writer's connections
+if database_settings.read_db_url == database_settings.db_url:
+    read_engine = engine
+else:
+    read_engine = create_engine(
+        database_settings.read_db_url, echo=False, connect_args=connect_args, **pool_args
+    )
+    listen_pragmas(sync_engine=read_engine, read_only=True)
+# aiosqlite defaults to NullPool, which ignores the pool settings
+async_engine = (
+    create_async_engine(
+        database_settings.async_db_url, echo=False, poolclass=AsyncAdaptedQueuePool, **pool_args
+    )
+    if database_settings.asynchronous
+    else None
 )
-engine = create_engine(constants.settings.database.db_url, echo=False, connect_args=connect_args)
+if async_engine is not None:
+    listen_pragmas(
+        sync_engine=async_engine.sync_engine, read_only=database_settings.sqlite.read_only_pool
+    )
 
 
 def create_db_and_tables() -> None:
     SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        if unconverted := list_unconverted(session=session, tables=SQLModel.metadata.sorted_tables):
+            sys.exit(
+                f"Stored values don't match the database.fixed_point setting in: "
+                f"{', '.join(x.name for x in unconverted)}. Run `Weatherdan migrate-values`"
+            )
+        if UNIFIED_READINGS and not session.exec(select(MetricReading).limit(1)).first():
+            # First start on the unified table, carry the per-category readings over
+            for model in ROLLUP_MODELS:
+                copy_readings(session=session, model=model)
+        for model, rollup_model in ROLLUP_MODELS.items():
+            if (
+                session.exec(select(get_source(model=model)).limit(1)).first()
+                and not session.exec(select(rollup_model).limit(1)).first()
+            ):
+                rebuild_rollups(session=session, model=model)
+        session.commit()
+
+
+def begin_immediate(connection: Connection) -> None:
+    connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def disable_autobegin(dbapi_connection: Any, _: Any) -> None:  # noqa: ANN401
+    dbapi_connection.isolation_level = None
+
+
+def convert_tables() -> dict[str, int]:
+    # pysqlite only opens a transaction before DML, so a dropped table would be committed on its
+    # own. This engine leaves BEGIN to SQLAlchemy, putting every rebuild in one transaction
+    migration_engine = create_engine(
+        database_settings.db_url, echo=False, connect_args=connect_args
+    )
+    if is_sqlite:
+        event.listen(migration_engine, "connect", disable_autobegin)
+        event.listen(migration_engine, "begin", begin_immediate)
+    converted = {}
+    try:
+        with Session(migration_engine) as session:
+            SQLModel.metadata.create_all(session.connection())
+            # Rollups are derived from the readings, so they're rebuilt rather than copied
+            rollup_tables = {x.__tablename__: x for x in ROLLUP_MODELS.values()}
+            for table in list_unconverted(session=session, tables=SQLModel.metadata.sorted_tables):
+                converted[table.name] = convert_values(
+                    session=session, table=table, copy=table.name not in rollup_tables
+                )
+            for model, rollup_model in ROLLUP_MODELS.items():
+                if rollup_model.__tablename__ in converted:
+                    rebuild_rollups(session=session, model=model)
+                    converted[rollup_model.__tablename__] = session.exec(
+                        select(func.count()).select_from(rollup_model)
+                    ).one()
+            session.commit()
+    finally:
+        migration_engine.dispose()
+    return converted
 
 
 def get_session() -> Session:
     with Session(engine) as session:
         yield session
+
+
+def get_read_session() -> Session:
+    with Session(read_engine) as session:
+        yield session
+
+
+def open_session(function: Callable[[Session], T]) -> T:
+    with Session(read_engine) as session:
+        return function(session)
+
+
+async def run_session(function: Callable[[Session], T]) -> T:
+    # Runs the same query code either on the event loop through the async engine, or on the
+    # threadpool with the sync engine
+    if async_engine is None:
+        return await run_in_threadpool(open_session, function)
+    async with AsyncSession(async_engine) as session:
+        return await session.run_sync(function)
@@ -0,0 +1,38 @@
+__all__ = ["HistoryCache"]
+
+import json
+import logging
+from collections.abc import Hashable
+from hashlib import blake2b
+from pathlib import Path
+from typing import Self
+
+LOGGER = logging.getLogger(__name__)
+
+
+class HistoryCache:
+    def __init__(self: Self, folder: Path):
+        self.folder = folder
+        self.folder.mkdir(exist_ok=True, parents=True)
+
+    def _get_path(self: Self, key: tuple[Hashable, ...]) -> Path:
+        digest = blake2b("|".join(str(x) for x in key).encode(), digest_size=16).hexdigest()
+        return self.folder / f"{digest}.json"
+
+    def get(self: Self, key: tuple[Hashable, ...]) -> dict[str, str] | None:
+        path = self._get_path(key=key)
+        if not path.exists():
+            return None
+        try:
+            with path.open("r", encoding="UTF-8") as stream:
+                return json.load(stream)
+        except (OSError, json.JSONDecodeError):
+            LOGGER.warning("Ignoring unreadable cache entry: %s", path.name)
+            return None
+
+    def set(self: Self, key: tuple[Hashable, ...], value: dict[str, str]) -> None:
+        path = self._get_path(key=key)
+        temp_path = path.with_suffix(".tmp")
+        with temp_path.open("w", encoding="UTF-8") as stream:
+            json.dump(value, stream)
+        temp_path.replace(path)
@@ -0,0 +1,27 @@
+__all__ = ["TokenBucket"]
+
+import asyncio
+from time import monotonic
+from typing import Self
+
+
+class TokenBucket:
+    def __init__(self: Self, calls: int, period: float):
+        self.capacity = calls
+        self.rate = calls / period
+        self.tokens = float(calls)
+        self.updated = monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self: Self) -> None:
+        now = monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self: Self) -> None:
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
@@ -1,33 +1,49 @@
 __all__ = ["Ecowitt"]
 
+import asyncio
 import logging
 import platform
 import re
-import sys
 from datetime import UTC, datetime, timedelta
 from decimal import Decimal
-from functools import cached_property
+from json import JSONDecodeError
 from typing import Any, Self
 from urllib.parse import urlencode
 
+from httpx import AsyncClient, ConnectError, HTTPStatusError, Limits, TimeoutException
 from pydantic import TypeAdapter, ValidationError
-from ratelimit import limits, sleep_and_retry
-from requests import get
-from requests.exceptions import ConnectionError, HTTPError, JSONDecodeError, ReadTimeout
 
 from weatherdan import __version__, elapsed_timer
+from weatherdan.ecowitt.cache import HistoryCache
 from weatherdan.ecowitt.category import Category
 from weatherdan.ecowitt.exceptions import AuthenticationError, ServiceError
+from weatherdan.ecowitt.limiter import TokenBucket
 from weatherdan.ecowitt.schemas import Device, LiveReading
 
 MINUTE = 60
+HISTORY_EPOCH = datetime(2000, 1, 1)
+HISTORY_WINDOW = timedelta(days=30)
+HISTORY_DELAY = timedelta(days=1)
+UNITS = {
+    "temp_unitid": 1,
+    "pressure_unitid": 3,
+    "wind_speed_unitid": 7,
+    "rainfall_unitid": 12,
+    "solar_irradiance_unitid": 14,
+}
 LOGGER = logging.getLogger(__name__)
 
 
 class Ecowitt:
     API_URL = "https://api.ecowitt.net/api/v3"
 
-    def __init__(self: Self, application_key: str, api_key: str, timeout: float = 30.0):
+    def __init__(
+        self: Self,
+        application_key: str,
+        api_key: str,
+        timeout: float = 30.0,
+        cache: HistoryCache | None = None,
+    ):
         self.headers = {
             "Accept": "application/json",
             "User-Agent": f"Weatherdan/{__version__}/{platform.system()}: {platform.release()}",
@@ -35,19 +51,39 @@ def __init__(self: Self, application_key: str, api_key: str, timeout: float = 30
         self.timeout = timeout
         self.application_key = application_key
         self.api_key = api_key
+        self.limiter = TokenBucket(calls=10, period=MINUTE)
+        self.cache = cache
+        self._client: AsyncClient | None = None
+        self._device: Device | None = None
 
-    @cached_property
-    def device(self: Self) -> Device:
-        if devices := self.list_devices():
-            return devices[0]
-        sys.exit("No Ecowitt device")
+    @property
+    def client(self: Self) -> AsyncClient:
+        if self._client is None:
+            self._client = AsyncClient(
+                headers=self.headers,
+                timeout=self.timeout,
+                limits=Limits(max_connections=4, max_keepalive_connections=4),
+            )
+        return self._client
+
+    async def close(self: Self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
-    @sleep_and_retry
-    @limits(calls=10, period=MINUTE)
-    def _perform_get_request(self: Self, url: str, params: dict[str, str]) -> dict[str, Any]:
+    async def get_device(self: Self) -> Device:
+        if self._device is None:
+            if not (devices := await self.list_devices()):
+                msg = "No Ecowitt device"
+                raise ServiceError(msg)
+            self._device = devices[0]
+        return self._device
+
+    async def _perform_get_request(self: Self, url: str, params: dict[str, str]) -> dict[str, Any]:
+        await self.limiter.acquire()
         try:
             with elapsed_timer() as elapsed:
-                response = get(url, params=params, headers=self.headers, timeout=self.timeout)
+                response = await self.client.get(url, params=params)
 
             cache_params = f"?{urlencode({k: params[k] for k in sorted(params)})}"
             for x in ["application_key=", "api_key=", "mac="]:
@@ -59,19 +95,19 @@ def _perform_get_request(self: Self, url: str, params: dict[str, str]) -> dict[s
 
             response.raise_for_status()
             return response.json()
-        except ConnectionError as err:
+        except ConnectError as err:
             msg = f"Unable to connect to '{url}'"
             raise ServiceError(msg) from err
-        except HTTPError as err:
+        except HTTPStatusError as err:
             raise ServiceError(err.response.text) from err
         except JSONDecodeError as err:
             msg = f"Unable to parse response from '{url}' as Json"
             raise ServiceError(msg) from err
-        except ReadTimeout as err:
+        except TimeoutException as err:
             msg = "Server took too long to respond"
             raise ServiceError(msg) from err
 
-    def _get_request(
+    async def _get_request(
         self: Self, endpoint: str, params: dict[str, str] | None = None
     ) -> dict[str, Any]:
         if params is None:
@@ -81,7 +117,7 @@ def _get_request(
 
         url = self.API_URL + endpoint
 
-        response = self._perform_get_request(url=url, params=params)
+        response = await self._perform_get_request(url=url, params=params)
         if response["code"] != 0:
             if response["code"] == 40010:
                 raise AuthenticationError(response["msg"])
@@ -89,96 +125,149 @@ def _get_request(
             raise ServiceError(msg)
         return response
 
-    def test_credentials(self: Self) -> bool:
+    async def test_credentials(self: Self) -> bool:
         try:
-            self.list_devices()
+            await self.list_devices()
             return True  # noqa: TRY300
         except AuthenticationError:
             pass
         return False
 
-    def list_devices(self: Self) -> list[Device]:
+    async def list_devices(self: Self) -> list[Device]:
         try:
-            results = self._retrieve_all_responses(endpoint="/device/list")
+            results = await self._retrieve_all_responses(endpoint="/device/list")
             adapter = TypeAdapter(list[Device])
             return adapter.validate_python(results)
         except ValidationError as err:
             raise ServiceError(err) from err
 
-    def _make_history_request(
-        self: Self, device: str, category: Category, start_date: datetime, end_date: datetime
-    ) -> dict[datetime, Decimal]:
-        try:
-            results = self._get_request(
-                endpoint="/device/history",
-                params={
-                    "mac": device,
-                    "start_date": start_date.isoformat(),
-                    "end_date": end_date.isoformat(),
-                    "cycle_type": "30min",
-                    "call_back": category.value,
-                    "temp_unitid": 1,
-                    "pressure_unitid": 3,
-                    "wind_speed_unitid": 7,
-                    "rainfall_unitid": 12,
-                    "solar_irradiance_unitid": 14,
-                },
-            )["data"]
-            if not results:
-                return {}
-            return {
-                datetime.fromtimestamp(int(k), tz=UTC).astimezone(): Decimal(v)
-                for k, v in results[category.group_1][category.group_2]["list"].items()
-            }
-        except ValidationError as err:
-            raise ServiceError(err) from err
+    async def _make_history_request(
+        self: Self,
+        device: str,
+        categories: list[Category],
+        start_date: datetime,
+        end_date: datetime,
+    ) -> dict[Category, dict[str, str]]:
+        response = await self._get_request(
+            endpoint="/device/history",
+            params={
+                "mac": device,
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+                "cycle_type": "30min",
+                "call_back": ",".join(x.value for x in categories),
+                **UNITS,
+            },
+        )
+        if not (results := response["data"]):
+            return {x: {} for x in categories}
+        return {
+            x: results.get(x.group_1, {}).get(x.group_2, {}).get("list", {}) for x in categories
+        }
 
-    def get_history_readings(
-        self: Self, device: str, category: Category, start_date: datetime
-    ) -> dict[datetime, Decimal]:
-        all_readings = {}
-        while start_date < datetime.now():
-            end_date = min(start_date + timedelta(days=31), datetime.now())
-            all_readings.update(
-                self._make_history_request(
-                    device=device, category=category, start_date=start_date, end_date=end_date
+    async def _get_history_window(
+        self: Self,
+        device: str,
+        categories: list[Category],
+        start_date: datetime,
+        end_date: datetime,
+    ) -> dict[Category, dict[str, str]]:
+        # Closed windows never change, so only their uncached categories need requesting
+        closed = self.cache is not None and end_date + HISTORY_DELAY < datetime.now()
+        keys = {
+            x: (device, x.value, start_date.isoformat(), end_date.isoformat(), urlencode(UNITS))
+            for x in categories
+        }
+        results = {}
+        if closed:
+            for category, key in keys.items():
+                if (cached := self.cache.get(key=key)) is not None:
+                    results[category] = cached
+        if missing := [x for x in categories if x not in results]:
+            response = await self._make_history_request(
+                device=device, categories=missing, start_date=start_date, end_date=end_date
+            )
+            results.update(response)
+            if closed:
+                # An empty response can be an outage or a sensor that wasn't reporting yet, so it's
+                # requested again next time rather than cached as the window's final answer
+                for category in missing:
+                    if response[category]:
+                        self.cache.set(key=keys[category], value=response[category])
+        return results
+
+    async def get_all_history_readings(
+        self: Self, device: str, categories: list[Category], start_date: datetime
+    ) -> dict[Category, dict[datetime, Decimal]]:
+        # Align windows to a fixed grid so the same windows, and cache keys, are requested each time
+        now = datetime.now()
+        window_start = (
+            HISTORY_EPOCH + (start_date - HISTORY_EPOCH) // HISTORY_WINDOW * HISTORY_WINDOW
+        )
+        windows = []
+        while window_start < now:
+            windows.append((window_start, min(window_start + HISTORY_WINDOW, now)))
+            window_start += HISTORY_WINDOW
+        all_readings = {x: {} for x in categories}
+        for results in await asyncio.gather(
+            *(
+                self._get_history_window(
+                    device=device, categories=categories, start_date=start, end_date=end
                 )
+                for start, end in windows
             )
-            start_date += timedelta(days=30)
+        ):
+            for category, readings in results.items():
+                all_readings[category].update(
+                    {
+                        datetime.fromtimestamp(int(k), tz=UTC).astimezone(): Decimal(v)
+                        for k, v in readings.items()
+                    }
+                )
         return all_readings
 
-    def get_live_reading(self: Self, device: str, category: Category) -> LiveReading | None:
+    async def get_history_readings(
+        self: Self, device: str, category: Category, start_date: datetime
+    ) -> dict[datetime, Decimal]:
+        all_readings = await self.get_all_history_readings(
+            device=device, categories=[category], start_date=start_date
+        )
+        return all_readings[category]
+
+    async def get_live_readings(
+        self: Self, device: str, categories: list[Category]
+    ) -> dict[Category, LiveReading]:
         try:
-            result = self._get_request(
+            response = await self._get_request(
                 endpoint="/device/real_time",
-                params={
-                    "mac": device,
-                    "call_back": category.value,
-                    "temp_unitid": 1,
-                    "pressure_unitid": 3,
-                    "wind_speed_unitid": 7,
-                    "rainfall_unitid": 12,
-                    "solar_irradiance_unitid": 14,
-                },
-            )["data"]
-            if not result:
-                return None
+                params={"mac": device, "call_back": ",".join(x.value for x in categories), **UNITS},
+            )
+            if not (result := response["data"]):
+                return {}
             adapter = TypeAdapter(LiveReading)
-            return adapter.validate_python(result[category.group_1][category.group_2])
+            return {
+                x: adapter.validate_python(result[x.group_1][x.group_2])
+                for x in categories
+                if x.group_2 in result.get(x.group_1, {})
+            }
         except ValidationError as err:
             raise ServiceError(err) from err
 
-    def _retrieve_all_responses(
+    async def get_live_reading(self: Self, device: str, category: Category) -> LiveReading | None:
+        live_readings = await self.get_live_readings(device=device, categories=[category])
+        return live_readings.get(category)
+
+    async def _retrieve_all_responses(
         self: Self, endpoint: str, params: dict[str, Any] | None = None
     ) -> list[dict[str, Any]]:
         if params is None:
             params = {}
         params["limit"] = 100
         params["page"] = 1
-        response = self._get_request(endpoint=endpoint, params=params)["data"]
+        response = (await self._get_request(endpoint=endpoint, params=params))["data"]
         results = response["list"]
         while response["list"] and len(results) < int(response["total"]):
             params["page"] += 1
-            response = self._get_request(endpoint=endpoint, params=params)["data"]
+            response = (await self._get_request(endpoint=endpoint, params=params))["data"]
             results.extend(response["list"])
         return results
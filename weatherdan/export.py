@@ -0,0 +1,84 @@
+__all__ = ["FileFormat", "stream_export"]
+
+import csv
+import json
+from collections.abc import Iterator
+from enum import Enum
+from io import StringIO
+from typing import Self
+
+from sqlalchemy import case, func, type_coerce, union
+from sqlmodel import Session, select
+from sqlmodel.sql.expression import Select, SelectOfScalar
+
+from weatherdan.database import read_engine
+from weatherdan.models import MetricReading, Reading
+from weatherdan.storage import UNIFIED_READINGS, get_source, get_view
+
+EXPORT_BATCH_SIZE = 1000
+
+
+class FileFormat(Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+    @property
+    def media_type(self: Self) -> str:
+        return "text/csv" if self == FileFormat.CSV else "application/x-ndjson"
+
+
+def select_export(*models: type[Reading]) -> Select | SelectOfScalar:
+    if len(models) == 1:
+        source = get_source(model=models[0])
+        return select(source.datestamp, source.value).order_by(source.datestamp)
+    if UNIFIED_READINGS:
+        # One pass over the unified table, pivoting each metric into its own column
+        return (
+            select(
+                MetricReading.datestamp,
+                *(
+                    type_coerce(
+                        func.max(
+                            case((MetricReading.metric == x.__tablename__, MetricReading.value))
+                        ),
+                        get_view(model=x).value.type,
+                    )
+                    for x in models
+                ),
+            )
+            .where(MetricReading.metric.in_([x.__tablename__ for x in models]))
+            .group_by(MetricReading.datestamp)
+            .order_by(MetricReading.datestamp)
+        )
+    datestamps = union(*(select(x.datestamp) for x in models)).subquery()
+    statement = select(datestamps.c.datestamp, *(x.value for x in models))
+    for model in models:
+        statement = statement.outerjoin(model, model.datestamp == datestamps.c.datestamp)
+    return statement.order_by(datestamps.c.datestamp)
+
+
+def format_batch(rows: list[tuple], fields: list[str], export_format: FileFormat) -> str:
+    if export_format == FileFormat.NDJSON:
+        return "".join(
+            json.dumps(
+                dict(zip(fields, (None if x is None else str(x) for x in row), strict=True)),
+                separators=(",", ":"),
+            )
+            + "\n"
+            for row in rows
+        )
+    output = StringIO()
+    csv.writer(output, lineterminator="\n").writerows(rows)
+    return output.getvalue()
+
+
+def stream_export(*models: type[Reading], export_format: FileFormat) -> Iterator[bytes]:
+    # Runs after the request session has closed, so opens its own on the read-only pool and reads
+    # through a server-side cursor one batch at a time
+    fields = ["datestamp", *(["value"] if len(models) == 1 else [x.__tablename__ for x in models])]
+    if export_format == FileFormat.CSV:
+        yield format_batch(rows=[fields], fields=fields, export_format=export_format).encode()
+    statement = select_export(*models).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    with Session(read_engine) as session:
+        for rows in session.exec(statement).partitions():
+            yield format_batch(rows=rows, fields=fields, export_format=export_format).encode()
@@ -0,0 +1,116 @@
+__all__ = ["IMPORT_BATCH_SIZE", "ImportResult", "import_readings", "read_rows"]
+
+import csv
+import json
+from collections.abc import Iterable, Iterator
+from datetime import date
+from decimal import Decimal
+from itertools import islice
+from typing import Any, TextIO
+
+from pydantic import BaseModel
+from sqlmodel import Session
+
+from weatherdan import elapsed_timer
+from weatherdan.export import FileFormat
+from weatherdan.models import Reading
+from weatherdan.queries import ConflictPolicy, upsert_readings
+from weatherdan.rollups import update_rollups
+from weatherdan.storage import check_value
+
+IMPORT_BATCH_SIZE = 5000
+
+
+class ImportResult(BaseModel):
+    rows: int = 0
+    readings: int = 0
+    batches: int = 0
+    elapsed: float = 0
+    rows_per_second: float = 0
+
+
+def read_rows(file: TextIO, file_format: FileFormat) -> Iterator[dict[str, Any]]:
+    if file_format == FileFormat.CSV:
+        yield from csv.DictReader(file)
+        return
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+def parse_value(value: str | float) -> Decimal:
+    try:
+        result = Decimal(str(value))
+    except ArithmeticError as err:
+        msg = f"Value must be a number: {value}"
+        raise ValueError(msg) from err
+    if not result.is_finite():
+        msg = f"Value must be finite: {value}"
+        raise ValueError(msg)
+    return result
+
+
+def merge_value(
+    readings: dict[date, Decimal], datestamp: date, value: Decimal, policy: ConflictPolicy
+) -> None:
+    # Duplicates within a file follow the same policy as conflicts with stored readings
+    if datestamp not in readings or policy == ConflictPolicy.REPLACE:
+        readings[datestamp] = value
+    elif policy == ConflictPolicy.KEEP_MAX:
+        readings[datestamp] = max(readings[datestamp], value)
+
+
+def parse_batch(
+    rows: list[dict[str, Any]],
+    columns: dict[str, type[Reading]],
+    policy: ConflictPolicy,
+    offset: int,
+) -> dict[type[Reading], dict[date, Decimal]]:
+    readings = {x: {} for x in columns.values()}
+    for number, row in enumerate(rows, start=offset):
+        try:
+            datestamp = date.fromisoformat(row["datestamp"])
+            for column, model in columns.items():
+                if (value := row.get(column)) in (None, ""):
+                    continue
+                merge_value(
+                    readings=readings[model],
+                    datestamp=datestamp,
+                    value=check_value(model=model, value=parse_value(value=value)),
+                    policy=policy,
+                )
+        except (ArithmeticError, KeyError, TypeError, ValueError) as err:
+            msg = f"Invalid reading on row {number}: {row} ({err})"
+            raise ValueError(msg) from err
+    return readings
+
+
+def import_readings(
+    session: Session,
+    rows: Iterable[dict[str, Any]],
+    columns: dict[str, type[Reading]],
+    policy: ConflictPolicy = ConflictPolicy.KEEP_MAX,
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> ImportResult:
+    # Each batch is committed on its own, so a failure keeps the batches before it
+    result = ImportResult()
+    rows = iter(rows)
+    with elapsed_timer() as elapsed:
+        try:
+            while batch := list(islice(rows, batch_size)):
+                readings = parse_batch(
+                    rows=batch, columns=columns, policy=policy, offset=result.rows + 1
+                )
+                for model, values in readings.items():
+                    upsert_readings(session=session, model=model, readings=values, policy=policy)
+                    update_rollups(session=session, model=model, datestamps=values)
+                    result.readings += len(values)
+                session.commit()
+                result.rows += len(batch)
+                result.batches += 1
+        except ValueError as err:
+            msg = f"{err}. {result.rows} rows in {result.batches} batches were committed before it"
+            raise ValueError(msg) from err
+    result.elapsed = round(elapsed(), 3)
+    result.rows_per_second = round(result.rows / result.elapsed, 1) if result.elapsed else 0
+    return result
@@ -0,0 +1,121 @@
+__all__ = ["CATEGORY_MODELS", "get_stale_categories", "refresh_categories"]
+
+import asyncio
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+
+from weatherdan.constants import constants
+from weatherdan.ecowitt.category import Category
+from weatherdan.ecowitt.schemas import LiveReading
+from weatherdan.metrics import METRICS
+from weatherdan.models import Reading
+from weatherdan.queries import ConflictPolicy, upsert_readings
+from weatherdan.rollups import update_rollups
+from weatherdan.samples import list_daily_highs, upsert_samples
+from weatherdan.storage import round_readings
+
+CATEGORY_MODELS: dict[Category, type[Reading]] = {x: y.model for x, y in METRICS.items()}
+
+
+def save_readings(
+    session: Session,
+    category: Category,
+    device: str,
+    history_readings: dict[datetime, Decimal],
+    live_reading: LiveReading | None = None,
+) -> None:
+    upsert_samples(session=session, category=category, device=device, readings=history_readings)
+    readings = {}
+    if history_readings:
+        # Rederive whole days so samples stored by earlier refreshes are included. The samples are
+        # what these days come from, so a revised lower sample replaces an earlier high
+        readings = list_daily_highs(
+            session=session,
+            category=category,
+            start=min(history_readings).date(),
+            end=max(history_readings).date(),
+        )
+    live_readings = {}
+    if live_reading:
+        key = live_reading.time.date()
+        if key in readings:
+            readings[key] = max(readings[key], live_reading.value)
+        else:
+            live_readings[key] = live_reading.value
+    model = CATEGORY_MODELS[category]
+    readings = round_readings(model=model, readings=readings)
+    live_readings = round_readings(model=model, readings=live_readings)
+    upsert_readings(session=session, model=model, readings=readings, policy=ConflictPolicy.REPLACE)
+    # A live reading on a day without samples only ever raises the stored value
+    upsert_readings(session=session, model=model, readings=live_readings)
+    update_rollups(session=session, model=model, datestamps=[*readings, *live_readings])
+
+
+def save_categories(
+    session: Session,
+    categories: list[Category],
+    device: str,
+    history_readings: dict[Category, dict[datetime, Decimal]],
+    live_readings: dict[Category, LiveReading],
+) -> None:
+    for category in categories:
+        save_readings(
+            session=session,
+            category=category,
+            device=device,
+            history_readings=history_readings[category],
+            live_reading=live_readings.get(category),
+        )
+    session.commit()
+
+
+def get_stale_categories(categories: list[Category]) -> list[Category]:
+    # A refresh_interval of 0 turns automatic refreshes off, page loads included, so only a
+    # forced refresh asks Ecowitt
+    if (refresh_interval := constants.settings.ecowitt.refresh_interval) <= 0:
+        return []
+    last_updated = constants.settings.last_updated
+    temp_time = datetime.now() - timedelta(minutes=refresh_interval)
+    return [
+        x for x in categories if getattr(last_updated, CATEGORY_MODELS[x].__tablename__) < temp_time
+    ]
+
+
+async def refresh_categories(
+    session: Session, categories: list[Category], force: bool = False
+) -> bool:
+    last_updated = constants.settings.last_updated
+    if not force:
+        categories = get_stale_categories(categories=categories)
+    if not categories:
+        return False
+
+    device = await constants.ecowitt.get_device()
+    history_readings, live_readings = await asyncio.gather(
+        constants.ecowitt.get_all_history_readings(
+            device=device.mac,
+            categories=categories,
+            start_date=min(
+                getattr(last_updated, CATEGORY_MODELS[x].__tablename__) for x in categories
+            ),
+        ),
+        constants.ecowitt.get_live_readings(device=device.mac, categories=categories),
+    )
+    await run_in_threadpool(
+        save_categories,
+        session=session,
+        categories=categories,
+        device=device.mac,
+        history_readings=history_readings,
+        live_readings=live_readings,
+    )
+
+    for category in categories:
+        table = CATEGORY_MODELS[category].__tablename__
+        constants.readings_cache.invalidate(table=table)
+        setattr(last_updated, table, datetime.now())
+    constants.settings.save()
+    return True
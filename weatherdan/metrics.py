@@ -0,0 +1,80 @@
+__all__ = ["METRICS", "Dashboard", "Metric"]
+
+from pydantic import BaseModel, create_model
+from sqlmodel import SQLModel
+
+from weatherdan.aggregation import Aggregation
+from weatherdan.ecowitt.category import Category
+from weatherdan.models import (
+    GraphData,
+    Rainfall,
+    RainfallRollup,
+    Reading,
+    Rollup,
+    Solar,
+    SolarRollup,
+    UVIndex,
+    UVIndexRollup,
+    Wind,
+    WindRollup,
+)
+
+
+class Metric(BaseModel, frozen=True):
+    category: Category
+    model: type[Reading]
+    rollup_model: type[Rollup]
+    name: str
+    slug: str
+    aggregation: Aggregation = Aggregation.TOTAL
+    unit: str = ""
+    unit_label: str
+
+
+METRICS: dict[Category, Metric] = {
+    x.category: x
+    for x in (
+        Metric(
+            category=Category.RAINFALL,
+            model=Rainfall,
+            rollup_model=RainfallRollup,
+            name="Rainfall",
+            slug="rainfall",
+            unit="mm",
+            unit_label="Millimetres",
+        ),
+        Metric(
+            category=Category.SOLAR,
+            model=Solar,
+            rollup_model=SolarRollup,
+            name="Solar",
+            slug="solar",
+            unit="lx",
+            unit_label="Lux",
+        ),
+        Metric(
+            category=Category.UV_INDEX,
+            model=UVIndex,
+            rollup_model=UVIndexRollup,
+            name="UV Index",
+            slug="uv-index",
+            unit_label="Index",
+        ),
+        Metric(
+            category=Category.WIND,
+            model=Wind,
+            rollup_model=WindRollup,
+            name="Wind",
+            slug="wind",
+            unit="km/h",
+            unit_label="Kilometers per Hour",
+        ),
+    )
+}
+
+# One graph per metric, keyed by table name
+Dashboard = create_model(
+    "Dashboard",
+    __base__=SQLModel,
+    **{x.model.__tablename__: (GraphData, ...) for x in METRICS.values()},
+)
@@ -1,11 +1,93 @@
-__all__ = ["GraphData", "Rainfall", "Reading", "Solar", "UVIndex", "WeekReading", "Wind"]
+__all__ = [
+    "GraphData",
+    "MetricReading",
+    "Rainfall",
+    "RainfallRollup",
+    "Reading",
+    "ReadingColumns",
+    "Rollup",
+    "Sample",
+    "SampleReading",
+    "ScaledDecimal",
+    "Solar",
+    "SolarRollup",
+    "UVIndex",
+    "UVIndexRollup",
+    "WeekReading",
+    "Wind",
+    "WindRollup",
+]
 
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal
-from typing import Self
+from typing import Any, Self
 
+from sqlalchemy import BigInteger, Dialect, Index, Numeric, TypeDecorator
+from sqlalchemy.types import TypeEngine
 from sqlmodel import Field, SQLModel
 
+from weatherdan.ecowitt.category import Category
+from weatherdan.timeframe import Timeframe
+
+# Decimal places kept per metric when fixed point storage is on
+RAINFALL_SCALE = 1
+SOLAR_SCALE = 0
+UV_INDEX_SCALE = 0
+WIND_SCALE = 1
+READING_SCALE = max(RAINFALL_SCALE, SOLAR_SCALE, UV_INDEX_SCALE, WIND_SCALE)
+INT64_MAX = 2**63 - 1
+
+
+class ScaledDecimal(TypeDecorator):
+    # Stored as NUMERIC, or with fixed point on as integer multiples of 10**-scale so sums and
+    # comparisons run as native integer arithmetic and read back exactly. The database module
+    # switches fixed point on from the settings
+    impl = Numeric
+    cache_ok = True
+
+    def __init__(self: Self, scale: int, fixed_point: bool = False, places: int | None = None):
+        super().__init__()
+        self.scale = scale
+        self.fixed_point = fixed_point
+        # Decimal places values read back with, fewer than stored for a metric in the unified table
+        self.places = scale if places is None else places
+
+    def load_dialect_impl(self: Self, dialect: Dialect) -> TypeEngine:
+        return dialect.type_descriptor(BigInteger() if self.fixed_point else Numeric())
+
+    def to_scaled(self: Self, value: Decimal) -> int:
+        # Refuses values that don't fit rather than rounding them
+        scaled = Decimal(str(value)).scaleb(self.scale)
+        if scaled != scaled.to_integral_value():
+            msg = f"{value} is finer than the stored precision of {Decimal(1).scaleb(-self.scale)}"
+            raise ValueError(msg)
+        if abs(scaled) > INT64_MAX:
+            msg = f"{value} is too large to store as a 64-bit integer"
+            raise ValueError(msg)
+        return int(scaled)
+
+    def quantize(self: Self, value: Decimal) -> Decimal:
+        if not self.fixed_point:
+            return value
+        return value.quantize(Decimal(1).scaleb(-self.scale))
+
+    def process_bind_param(self: Self, value: Decimal | None, _: Dialect) -> Decimal | int | None:
+        if value is None or not self.fixed_point:
+            return value
+        return self.to_scaled(value=value)
+
+    def process_result_value(self: Self, value: Decimal | int | None, _: Dialect) -> Decimal | None:
+        if value is None or not self.fixed_point:
+            return value
+        value = Decimal(value).scaleb(-self.scale)
+        if self.places < self.scale:
+            value = value.quantize(Decimal(1).scaleb(-self.places))
+        return value
+
+
+def decimal_field(scale: int) -> Any:  # noqa: ANN401
+    return Field(sa_type=ScaledDecimal(scale=scale))
+
 
 class Reading(SQLModel):
     datestamp: date = Field(index=True, primary_key=True)
@@ -15,6 +97,8 @@ class Reading(SQLModel):
 class Rainfall(Reading, table=True):
     __tablename__ = "rainfall"
 
+    value: Decimal = decimal_field(scale=RAINFALL_SCALE)
+
     def __lt__(self: Self, other) -> int:  # noqa: ANN001
         if not isinstance(other, Rainfall):
             raise NotImplementedError
@@ -32,6 +116,8 @@ def __hash__(self: Self) -> int:
 class Solar(Reading, table=True):
     __tablename__ = "solar"
 
+    value: Decimal = decimal_field(scale=SOLAR_SCALE)
+
     def __lt__(self: Self, other) -> int:  # noqa: ANN001
         if not isinstance(other, Solar):
             raise NotImplementedError
@@ -49,6 +135,8 @@ def __hash__(self: Self) -> int:
 class UVIndex(Reading, table=True):
     __tablename__ = "uv_index"
 
+    value: Decimal = decimal_field(scale=UV_INDEX_SCALE)
+
     def __lt__(self: Self, other) -> int:  # noqa: ANN001
         if not isinstance(other, UVIndex):
             raise NotImplementedError
@@ -66,6 +154,8 @@ def __hash__(self: Self) -> int:
 class Wind(Reading, table=True):
     __tablename__ = "wind"
 
+    value: Decimal = decimal_field(scale=WIND_SCALE)
+
     def __lt__(self: Self, other) -> int:  # noqa: ANN001
         if not isinstance(other, Wind):
             raise NotImplementedError
@@ -80,6 +170,23 @@ def __hash__(self: Self) -> int:
         return hash((type(self), self.datestamp))
 
 
+class MetricReading(SQLModel, table=True):
+    __tablename__ = "reading"
+    # Rows are stored in primary key order on SQLite, so each metric's readings are one
+    # contiguous range. Postgres gets an index that also covers the value
+    __table_args__ = (
+        Index(
+            "ix_reading_metric_datestamp", "metric", "datestamp", postgresql_include=["value"]
+        ).ddl_if(dialect="postgresql"),
+        {"sqlite_with_rowid": False},
+    )
+
+    metric: str = Field(primary_key=True)
+    datestamp: date = Field(primary_key=True)
+    # One column serves every metric, so it keeps the finest precision
+    value: Decimal = decimal_field(scale=READING_SCALE)
+
+
 class WeekReading(SQLModel):
     start_datestamp: date
     end_datestamp: date
@@ -103,7 +210,71 @@ def __hash__(self: Self) -> int:
         return hash((type(self), self.start_datestamp, self.end_datestamp))
 
 
+class SampleReading(SQLModel):
+    timestamp: datetime
+    value: Decimal
+
+
 class GraphData(SQLModel):
-    high: list[Reading | WeekReading] = Field(default_factory=list)
-    average: list[Reading | WeekReading] = Field(default_factory=list)
-    low: list[Reading | WeekReading] = Field(default_factory=list)
+    total: list[Reading | WeekReading | SampleReading] = Field(default_factory=list)
+    high: list[Reading | WeekReading | SampleReading] = Field(default_factory=list)
+    average: list[Reading | WeekReading | SampleReading] = Field(default_factory=list)
+    low: list[Reading | WeekReading | SampleReading] = Field(default_factory=list)
+
+
+class ReadingColumns(SQLModel):
+    dates: list[date] | None = None
+    end_dates: list[date] | None = None
+    timestamps: list[datetime] | None = None
+    values: list[Decimal] = Field(default_factory=list)
+
+
+class Rollup(SQLModel):
+    timeframe: Timeframe = Field(primary_key=True)
+    start_datestamp: date = Field(primary_key=True)
+    end_datestamp: date
+    total: Decimal
+    count: int
+    high: Decimal
+    low: Decimal
+
+
+class RainfallRollup(Rollup, table=True):
+    __tablename__ = "rainfall_rollup"
+
+    total: Decimal = decimal_field(scale=RAINFALL_SCALE)
+    high: Decimal = decimal_field(scale=RAINFALL_SCALE)
+    low: Decimal = decimal_field(scale=RAINFALL_SCALE)
+
+
+class SolarRollup(Rollup, table=True):
+    __tablename__ = "solar_rollup"
+
+    total: Decimal = decimal_field(scale=SOLAR_SCALE)
+    high: Decimal = decimal_field(scale=SOLAR_SCALE)
+    low: Decimal = decimal_field(scale=SOLAR_SCALE)
+
+
+class UVIndexRollup(Rollup, table=True):
+    __tablename__ = "uv_index_rollup"
+
+    total: Decimal = decimal_field(scale=UV_INDEX_SCALE)
+    high: Decimal = decimal_field(scale=UV_INDEX_SCALE)
+    low: Decimal = decimal_field(scale=UV_INDEX_SCALE)
+
+
+class WindRollup(Rollup, table=True):
+    __tablename__ = "wind_rollup"
+
+    total: Decimal = decimal_field(scale=WIND_SCALE)
+    high: Decimal = decimal_field(scale=WIND_SCALE)
+    low: Decimal = decimal_field(scale=WIND_SCALE)
+
+
+class Sample(SQLModel, table=True):
+    __tablename__ = "sample"
+
+    category: Category = Field(primary_key=True)
+    timestamp: int = Field(primary_key=True, sa_type=BigInteger)
+    device: str = Field(primary_key=True)
+    value: int
@@ -0,0 +1,120 @@
+__all__ = [
+    "ConflictPolicy",
+    "get_daily_series",
+    "get_date_range",
+    "list_daily_readings",
+    "upsert_readings",
+]
+
+from datetime import MAXYEAR, MINYEAR, date
+from decimal import Decimal
+from enum import Enum
+
+from sqlalchemy import case
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, extract, select
+from sqlmodel.sql.expression import Select, SelectOfScalar
+
+from weatherdan.models import MetricReading, Reading
+from weatherdan.series import Series
+from weatherdan.storage import UNIFIED_READINGS, get_source
+
+
+class ConflictPolicy(Enum):
+    REPLACE = "replace"
+    KEEP_MAX = "keep-max"
+    SKIP = "skip"
+
+
+def get_date_range(year: int, month: int | None = None) -> tuple[date, date] | None:
+    if not MINYEAR <= year < MAXYEAR:
+        return None
+    if not month:
+        return date(year, 1, 1), date(year + 1, 1, 1)
+    if not 1 <= month <= 12:
+        return None
+    if month == 12:
+        return date(year, month, 1), date(year + 1, 1, 1)
+    return date(year, month, 1), date(year, month + 1, 1)
+
+
+def filter_by_date(
+    statement: Select | SelectOfScalar,
+    model: type[Reading],
+    year: int | None = None,
+    month: int | None = None,
+) -> Select | SelectOfScalar:
+    if year:
+        if date_range := get_date_range(year=year, month=month):
+            return statement.where(
+                model.datestamp >= date_range[0], model.datestamp < date_range[1]
+            )
+        statement = statement.where(extract("year", model.datestamp) == year)
+    if month:
+        statement = statement.where(extract("month", model.datestamp) == month)
+    return statement
+
+
+def get_daily_series(
+    session: Session,
+    model: type[Reading],
+    year: int | None = None,
+    month: int | None = None,
+    max_entries: int = 28,
+) -> Series:
+    source = get_source(model=model)
+    statement = filter_by_date(
+        statement=select(source.datestamp, source.value), model=source, year=year, month=month
+    ).order_by(source.datestamp.desc())
+    if max_entries > 0:
+        statement = statement.limit(max_entries)
+    return Series.from_rows(rows=reversed(session.exec(statement).all()))
+
+
+def list_daily_readings(
+    session: Session,
+    model: type[Reading],
+    year: int | None = None,
+    month: int | None = None,
+    max_entries: int = 28,
+) -> list[Reading]:
+    return get_daily_series(
+        session=session, model=model, year=year, month=month, max_entries=max_entries
+    ).to_readings()
+
+
+def upsert_readings(
+    session: Session,
+    model: type[Reading],
+    readings: dict[date, Decimal],
+    policy: ConflictPolicy = ConflictPolicy.KEEP_MAX,
+) -> None:
+    insert = postgresql.insert if session.get_bind().dialect.name == "postgresql" else sqlite.insert
+    entries = [{"datestamp": key, "value": value} for key, value in sorted(readings.items())]
+    if not entries:
+        return
+    table = model
+    index_elements = [model.datestamp]
+    if UNIFIED_READINGS:
+        table = MetricReading
+        index_elements = [MetricReading.metric, MetricReading.datestamp]
+        for entry in entries:
+            entry["metric"] = model.__tablename__
+    statement = insert(table)
+    if policy == ConflictPolicy.SKIP:
+        statement = statement.on_conflict_do_nothing(index_elements=index_elements)
+    elif policy == ConflictPolicy.REPLACE:
+        statement = statement.on_conflict_do_update(
+            index_elements=index_elements, set_={"value": statement.excluded.value}
+        )
+    else:
+        statement = statement.on_conflict_do_update(
+            index_elements=index_elements,
+            set_={
+                "value": case(
+                    (statement.excluded.value > table.value, statement.excluded.value),
+                    else_=table.value,
+                )
+            },
+        )
+    session.execute(statement, entries)
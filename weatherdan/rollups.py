@@ -0,0 +1,337 @@
+__all__ = [
+    "ROLLUP_MODELS",
+    "get_rollup_series",
+    "list_months",
+    "list_rollup_graph",
+    "list_years",
+    "rebuild_rollups",
+    "update_rollups",
+]
+
+import logging
+from collections.abc import Iterable
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import func, insert, or_
+from sqlmodel import Session, delete, extract, select
+from sqlmodel.sql.expression import Select, SelectOfScalar
+
+from weatherdan.aggregation import Aggregation, get_bucket, get_week_range
+from weatherdan.columnar import Columns, calculate_columnar_rollups, is_available
+from weatherdan.metrics import METRICS
+from weatherdan.models import GraphData, Reading, Rollup, WeekReading
+from weatherdan.queries import get_daily_series, get_date_range, list_daily_readings
+from weatherdan.series import Series
+from weatherdan.storage import get_source
+from weatherdan.timeframe import Timeframe
+from weatherdan.utils import get_week_ends
+
+LOGGER = logging.getLogger(__name__)
+ROLLUP_MODELS: dict[type[Reading], type[Rollup]] = {
+    x.model: x.rollup_model for x in METRICS.values()
+}
+ROLLUP_TIMEFRAMES = (Timeframe.WEEKLY, Timeframe.MONTHLY, Timeframe.YEARLY)
+GRAPH_AGGREGATIONS = {
+    "total": Aggregation.TOTAL,
+    "high": Aggregation.HIGH,
+    "average": Aggregation.AVERAGE,
+    "low": Aggregation.LOW,
+}
+
+
+def get_bucket_ends(timeframe: Timeframe, value: date) -> tuple[date, date]:
+    if timeframe == Timeframe.WEEKLY:
+        return get_week_ends(value=value)
+    if timeframe == Timeframe.MONTHLY:
+        start = value.replace(day=1)
+        return start, (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    return value.replace(month=1, day=1), value.replace(month=12, day=31)
+
+
+def sum_buckets(session: Session, statement: SelectOfScalar) -> dict[date, Decimal]:
+    totals = {}
+    for key, value in session.exec(statement):
+        totals[key] = totals.get(key, 0) + value
+    return totals
+
+
+def calculate_rollups(
+    session: Session,
+    model: type[Reading],
+    timeframe: Timeframe,
+    start: date | None = None,
+    end: date | None = None,
+) -> list[dict[str, Any]]:
+    source = get_source(model=model)
+    dialect = session.get_bind().dialect.name
+    bucket = get_bucket(dialect=dialect, timeframe=timeframe, column=source.datestamp)
+    conditions = [source.datestamp >= start, source.datestamp <= end] if start and end else []
+    statement = (
+        select(
+            bucket,
+            func.sum(source.value),
+            func.count(),
+            func.max(source.value),
+            func.min(source.value),
+        )
+        .where(*conditions)
+        .group_by(bucket)
+    )
+    rows = session.exec(statement).all()
+    if dialect == "sqlite" and not source.value.type.fixed_point:
+        # SQLite keeps decimals as floats, so its SUM drifts. Totals are added up as Decimals
+        totals = sum_buckets(
+            session=session, statement=select(bucket, source.value).where(*conditions)
+        )
+        rows = [(key, totals[key], *values) for key, _, *values in rows]
+    return [
+        {
+            "timeframe": timeframe,
+            "start_datestamp": key,
+            "end_datestamp": get_bucket_ends(timeframe=timeframe, value=key)[1],
+            "total": total,
+            "count": count,
+            "high": high,
+            "low": low,
+        }
+        for key, total, count, high, low in rows
+    ]
+
+
+def insert_rollups(session: Session, model: type[Reading], rows: list[dict[str, Any]]) -> None:
+    # Bulk insert, building Rollup objects and flushing them costs more than the query
+    if rows:
+        session.execute(insert(ROLLUP_MODELS[model]), rows)
+
+
+def update_rollups(session: Session, model: type[Reading], datestamps: Iterable[date]) -> None:
+    if not (datestamps := set(datestamps)):
+        return
+    session.flush()
+    rollup_model = ROLLUP_MODELS[model]
+    for timeframe in ROLLUP_TIMEFRAMES:
+        start, _ = get_bucket_ends(timeframe=timeframe, value=min(datestamps))
+        _, end = get_bucket_ends(timeframe=timeframe, value=max(datestamps))
+        session.exec(
+            delete(rollup_model).where(
+                rollup_model.timeframe == timeframe,
+                rollup_model.start_datestamp >= start,
+                rollup_model.start_datestamp <= end,
+            )
+        )
+        insert_rollups(
+            session=session,
+            model=model,
+            rows=calculate_rollups(
+                session=session, model=model, timeframe=timeframe, start=start, end=end
+            ),
+        )
+
+
+def load_columns(session: Session, model: type[Reading]) -> Columns | None:
+    if not is_available():
+        return None
+    try:
+        return Columns.load(session=session, model=model)
+    except OverflowError:
+        LOGGER.warning("Unable to rebuild %s rollups with NumPy", model.__tablename__)
+        return None
+
+
+def rebuild_rollups(session: Session, model: type[Reading]) -> None:
+    session.flush()
+    rollup_model = ROLLUP_MODELS[model]
+    session.exec(delete(rollup_model))
+    columns = load_columns(session=session, model=model)
+    for timeframe in ROLLUP_TIMEFRAMES:
+        if columns is None:
+            rows = calculate_rollups(session=session, model=model, timeframe=timeframe)
+        else:
+            rows = [
+                {
+                    "timeframe": timeframe,
+                    "start_datestamp": start,
+                    "end_datestamp": end,
+                    "total": total,
+                    "count": count,
+                    "high": high,
+                    "low": low,
+                }
+                for start, end, total, count, high, low in calculate_columnar_rollups(
+                    columns=columns, timeframe=timeframe
+                )
+            ]
+        insert_rollups(session=session, model=model, rows=rows)
+
+
+def get_rollup_value(rollup: Rollup, aggregation: Aggregation) -> Decimal:
+    if aggregation == Aggregation.HIGH:
+        return rollup.high
+    if aggregation == Aggregation.AVERAGE:
+        return round(rollup.total / rollup.count, 2)
+    if aggregation == Aggregation.LOW:
+        return rollup.low
+    return rollup.total
+
+
+def filter_rollups(  # noqa: PLR0913
+    statement: Select | SelectOfScalar,
+    rollup_model: type[Rollup],
+    timeframe: Timeframe,
+    year: int | None = None,
+    month: int | None = None,
+    max_entries: int = 28,
+) -> Select | SelectOfScalar | None:
+    statement = statement.where(rollup_model.timeframe == timeframe)
+    if year and timeframe != Timeframe.YEARLY:
+        date_range = (
+            get_week_range(year=year)
+            if timeframe == Timeframe.WEEKLY
+            else get_date_range(year=year)
+        )
+        if not date_range:
+            return None
+        statement = statement.where(
+            rollup_model.start_datestamp >= date_range[0],
+            rollup_model.start_datestamp < date_range[1],
+        )
+    if month and timeframe == Timeframe.WEEKLY:
+        statement = statement.where(
+            or_(
+                extract("month", rollup_model.start_datestamp) == month,
+                extract("month", rollup_model.end_datestamp) == month,
+            )
+        )
+    statement = statement.order_by(rollup_model.start_datestamp.desc())
+    if max_entries > 0:
+        statement = statement.limit(max_entries)
+    return statement
+
+
+def list_rollups(  # noqa: PLR0913
+    session: Session,
+    model: type[Reading],
+    timeframe: Timeframe,
+    year: int | None = None,
+    month: int | None = None,
+    max_entries: int = 28,
+) -> list[Rollup]:
+    rollup_model = ROLLUP_MODELS[model]
+    statement = filter_rollups(
+        statement=select(rollup_model),
+        rollup_model=rollup_model,
+        timeframe=timeframe,
+        year=year,
+        month=month,
+        max_entries=max_entries,
+    )
+    if statement is None:
+        return []
+    return list(reversed(session.exec(statement).all()))
+
+
+def to_rollup_reading(
+    rollup: Rollup, timeframe: Timeframe, aggregation: Aggregation
+) -> Reading | WeekReading:
+    value = get_rollup_value(rollup=rollup, aggregation=aggregation)
+    if timeframe == Timeframe.WEEKLY:
+        return WeekReading(
+            start_datestamp=rollup.start_datestamp, end_datestamp=rollup.end_datestamp, value=value
+        )
+    return Reading(datestamp=rollup.start_datestamp, value=value)
+
+
+def get_rollup_series(  # noqa: PLR0913
+    session: Session,
+    model: type[Reading],
+    timeframe: Timeframe,
+    aggregation: Aggregation,
+    year: int | None = None,
+    month: int | None = None,
+    max_entries: int = 28,
+) -> Series:
+    if timeframe == Timeframe.DAILY:
+        return get_daily_series(
+            session=session, model=model, year=year, month=month, max_entries=max_entries
+        )
+    rollup_model = ROLLUP_MODELS[model]
+    columns = {
+        Aggregation.TOTAL: (rollup_model.total,),
+        Aggregation.HIGH: (rollup_model.high,),
+        Aggregation.AVERAGE: (rollup_model.total, rollup_model.count),
+        Aggregation.LOW: (rollup_model.low,),
+    }[aggregation]
+    statement = filter_rollups(
+        statement=select(rollup_model.start_datestamp, rollup_model.end_datestamp, *columns),
+        rollup_model=rollup_model,
+        timeframe=timeframe,
+        year=year,
+        month=month,
+        max_entries=max_entries,
+    )
+    rows = [] if statement is None else reversed(session.exec(statement).all())
+    if aggregation == Aggregation.AVERAGE:
+        rows = ((start, end, round(total / count, 2)) for start, end, total, count in rows)
+    if timeframe == Timeframe.WEEKLY:
+        return Series.from_week_rows(rows=rows)
+    return Series.from_rows(rows=((start, value) for start, _, value in rows))
+
+
+def list_rollup_graph(  # noqa: PLR0913
+    session: Session,
+    model: type[Reading],
+    timeframe: Timeframe,
+    year: int | None = None,
+    month: int | None = None,
+    max_entries: int = 28,
+) -> GraphData:
+    if timeframe == Timeframe.DAILY:
+        readings = list_daily_readings(
+            session=session, model=model, year=year, month=month, max_entries=max_entries
+        )
+        return GraphData(total=readings, high=readings, average=readings, low=readings)
+    rollups = list_rollups(
+        session=session,
+        model=model,
+        timeframe=timeframe,
+        year=year,
+        month=month,
+        max_entries=max_entries,
+    )
+    return GraphData(
+        **{
+            field: [
+                to_rollup_reading(rollup=x, timeframe=timeframe, aggregation=aggregation)
+                for x in rollups
+            ]
+            for field, aggregation in GRAPH_AGGREGATIONS.items()
+        }
+    )
+
+
+def list_years(session: Session, model: type[Reading]) -> list[int]:
+    rollup_model = ROLLUP_MODELS[model]
+    statement = (
+        select(rollup_model.start_datestamp)
+        .where(rollup_model.timeframe == Timeframe.YEARLY)
+        .order_by(rollup_model.start_datestamp)
+    )
+    return [x.year for x in session.exec(statement).all()]
+
+
+def list_months(session: Session, model: type[Reading], year: int) -> list[int]:
+    if not (date_range := get_date_range(year=year)):
+        return []
+    rollup_model = ROLLUP_MODELS[model]
+    statement = (
+        select(rollup_model.start_datestamp)
+        .where(
+            rollup_model.timeframe == Timeframe.MONTHLY,
+            rollup_model.start_datestamp >= date_range[0],
+            rollup_model.start_datestamp < date_range[1],
+        )
+        .order_by(rollup_model.start_datestamp)
+    )
+    return [x.month for x in session.exec(statement).all()]
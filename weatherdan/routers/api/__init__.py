@@ -2,16 +2,22 @@
 
 from fastapi import APIRouter
 
+from weatherdan.metrics import METRICS
 from weatherdan.responses import ErrorResponse
-from weatherdan.routers.api.rainfall import router as rainfall_router
-from weatherdan.routers.api.solar import router as solar_router
-from weatherdan.routers.api.uv_index import router as uv_index_router
-from weatherdan.routers.api.wind import router as wind_router
+from weatherdan.routers.api.cache import router as cache_router
+from weatherdan.routers.api.dashboard import router as dashboard_router
+from weatherdan.routers.api.export import router as export_router
+from weatherdan.routers.api.importer import router as import_router
+from weatherdan.routers.api.metric import create_router
+from weatherdan.routers.api.refresh import router as refresh_router
 
 router = APIRouter(
     prefix="/api", responses={422: {"description": "Validation error", "model": ErrorResponse}}
 )
-router.include_router(rainfall_router)
-router.include_router(solar_router)
-router.include_router(uv_index_router)
-router.include_router(wind_router)
+router.include_router(cache_router)
+router.include_router(dashboard_router)
+router.include_router(export_router)
+router.include_router(import_router)
+router.include_router(refresh_router)
+for metric in METRICS.values():
+    router.include_router(create_router(metric=metric))
@@ -0,0 +1,18 @@
+__all__ = ["router"]
+
+from fastapi import APIRouter
+
+from weatherdan.cache import CacheStats
+from weatherdan.constants import constants
+from weatherdan.responses import ErrorResponse
+
+router = APIRouter(
+    prefix="/cache",
+    tags=["Cache"],
+    responses={422: {"description": "Validation error", "model": ErrorResponse}},
+)
+
+
+@router.get(path="")
+def get_cache_stats() -> CacheStats:
+    return constants.readings_cache.stats
@@ -0,0 +1,55 @@
+__all__ = ["router"]
+
+import asyncio
+
+from fastapi import APIRouter, Query, Request, Response
+
+from weatherdan.metrics import METRICS, Dashboard
+from weatherdan.responses import ErrorResponse
+from weatherdan.routers.graphs import get_graph_data
+from weatherdan.routers.validators import get_validators, is_not_modified
+from weatherdan.timeframe import Timeframe
+
+router = APIRouter(
+    prefix="/dashboard",
+    tags=["Dashboard"],
+    responses={422: {"description": "Validation error", "model": ErrorResponse}},
+)
+
+
+@router.get(path="")
+async def get_dashboard(  # noqa: PLR0913
+    *,
+    request: Request,
+    response: Response,
+    timeframe: Timeframe = Timeframe.DAILY,
+    year: int | None = None,
+    month: int | None = None,
+    max_entries: int = Query(alias="max-entries", default=28),
+    points: int = Query(default=0, ge=0),
+) -> Dashboard:
+    headers = get_validators(*(x.model.__tablename__ for x in METRICS.values()))
+    if is_not_modified(request=request, headers=headers):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+    # Metrics load concurrently, each with its own session
+    results = await asyncio.gather(
+        *(
+            get_graph_data(
+                metric=metric,
+                timeframe=timeframe,
+                year=year,
+                month=month,
+                max_entries=max_entries,
+                points=points,
+            )
+            for metric in METRICS.values()
+        )
+    )
+    return Dashboard(
+        **{
+            metric.model.__tablename__: graph_data
+            for metric, graph_data in zip(METRICS.values(), results, strict=True)
+        }
+    )
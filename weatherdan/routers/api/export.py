@@ -0,0 +1,26 @@
+__all__ = ["router"]
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+
+from weatherdan.export import FileFormat, stream_export
+from weatherdan.ingest import CATEGORY_MODELS
+from weatherdan.responses import ErrorResponse
+
+router = APIRouter(
+    prefix="/export",
+    tags=["Export"],
+    responses={422: {"description": "Validation error", "model": ErrorResponse}},
+)
+
+
+@router.get(path="")
+def export_readings(
+    *, export_format: FileFormat = Query(alias="format", default=FileFormat.CSV)
+) -> StreamingResponse:
+    filename = f"weatherdan.{export_format.value}"
+    return StreamingResponse(
+        content=stream_export(*CATEGORY_MODELS.values(), export_format=export_format),
+        media_type=export_format.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
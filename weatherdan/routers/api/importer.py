@@ -0,0 +1,45 @@
+__all__ = ["router"]
+
+from io import TextIOWrapper
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile
+from sqlmodel import Session
+
+from weatherdan.constants import constants
+from weatherdan.database import get_session
+from weatherdan.export import FileFormat
+from weatherdan.importer import ImportResult, import_readings, read_rows
+from weatherdan.ingest import CATEGORY_MODELS
+from weatherdan.queries import ConflictPolicy
+from weatherdan.responses import ErrorResponse
+
+router = APIRouter(
+    prefix="/import",
+    tags=["Import"],
+    responses={422: {"description": "Validation error", "model": ErrorResponse}},
+)
+
+
+@router.post(path="")
+def import_file(
+    *,
+    session: Annotated[Session, Depends(get_session)],
+    file: UploadFile,
+    file_format: FileFormat = Query(alias="format", default=FileFormat.CSV),
+    policy: ConflictPolicy = ConflictPolicy.KEEP_MAX,
+) -> ImportResult:
+    try:
+        return import_readings(
+            session=session,
+            rows=read_rows(
+                file=TextIOWrapper(file.file, encoding="utf-8"), file_format=file_format
+            ),
+            columns={x.__tablename__: x for x in CATEGORY_MODELS.values()},
+            policy=policy,
+        )
+    except ValueError as err:
+        raise HTTPException(status_code=422, detail=str(err)) from err
+    finally:
+        for model in CATEGORY_MODELS.values():
+            constants.readings_cache.invalidate(table=model.__tablename__)
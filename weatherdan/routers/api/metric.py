@@ -0,0 +1,183 @@
+__all__ = ["create_router"]
+
+from datetime import date
+from io import TextIOWrapper
+from typing import Annotated
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session
+
+from weatherdan.constants import constants
+from weatherdan.database import get_session, run_session
+from weatherdan.export import FileFormat, stream_export
+from weatherdan.importer import ImportResult, import_readings, read_rows
+from weatherdan.ingest import get_stale_categories
+from weatherdan.metrics import Metric
+from weatherdan.models import GraphData, Reading, ReadingColumns, SampleReading, WeekReading
+from weatherdan.queries import ConflictPolicy
+from weatherdan.responses import ErrorResponse
+from weatherdan.rollups import get_rollup_series, update_rollups
+from weatherdan.routers import graphs
+from weatherdan.routers.validators import get_validators, is_not_modified
+from weatherdan.samples import SAMPLE_TIMEFRAMES, get_sample_series
+from weatherdan.scheduler import RefreshJob
+from weatherdan.series import Layout
+from weatherdan.storage import check_value, get_reading, save_reading
+from weatherdan.timeframe import Timeframe
+
+
+def create_router(metric: Metric) -> APIRouter:  # noqa: C901
+    # Every metric serves the same endpoints, only the registry entry changes
+    model = metric.model
+    table = model.__tablename__
+    router = APIRouter(
+        prefix=f"/{metric.slug}",
+        tags=[metric.name],
+        responses={422: {"description": "Validation error", "model": ErrorResponse}},
+    )
+
+    @router.get(path="", description=f"Values are in {metric.unit_label}.")
+    async def list_readings(  # noqa: PLR0913
+        *,
+        request: Request,
+        response: Response,
+        timeframe: Timeframe = Timeframe.DAILY,
+        year: int | None = None,
+        month: int | None = None,
+        max_entries: int = Query(alias="max-entries", default=28),
+        points: int = Query(default=0, ge=0),
+        layout: Layout = Layout.ROWS,
+    ) -> list[Reading | WeekReading | SampleReading] | ReadingColumns:
+        headers = get_validators(table)
+        if is_not_modified(request=request, headers=headers):
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
+        key = (table, timeframe, year, month, max_entries, points)
+        if timeframe in SAMPLE_TIMEFRAMES:
+            series = await constants.readings_cache.get_or_create_async(
+                key=key,
+                factory=lambda: run_session(
+                    function=lambda session: get_sample_series(
+                        session=session,
+                        category=metric.category,
+                        timeframe=timeframe,
+                        year=year,
+                        month=month,
+                        max_entries=max_entries,
+                        points=points,
+                    )
+                ),
+            )
+        else:
+            series = await constants.readings_cache.get_or_create_async(
+                key=key,
+                factory=lambda: run_session(
+                    function=lambda session: get_rollup_series(
+                        session=session,
+                        model=model,
+                        timeframe=timeframe,
+                        aggregation=metric.aggregation,
+                        year=year,
+                        month=month,
+                        max_entries=max_entries,
+                    )
+                ),
+            )
+        return Response(
+            content=series.to_json(layout=layout), media_type="application/json", headers=headers
+        )
+
+    @router.get(path="/graph", description=f"Values are in {metric.unit_label}.")
+    async def get_graph_data(  # noqa: PLR0913
+        *,
+        request: Request,
+        response: Response,
+        timeframe: Timeframe = Timeframe.DAILY,
+        year: int | None = None,
+        month: int | None = None,
+        max_entries: int = Query(alias="max-entries", default=28),
+        points: int = Query(default=0, ge=0),
+    ) -> GraphData:
+        headers = get_validators(table)
+        if is_not_modified(request=request, headers=headers):
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
+        return await graphs.get_graph_data(
+            metric=metric,
+            timeframe=timeframe,
+            year=year,
+            month=month,
+            max_entries=max_entries,
+            points=points,
+        )
+
+    @router.get(path="/export")
+    def export_readings(
+        *, export_format: FileFormat = Query(alias="format", default=FileFormat.CSV)
+    ) -> StreamingResponse:
+        filename = f"{table}.{export_format.value}"
+        return StreamingResponse(
+            content=stream_export(model, export_format=export_format),
+            media_type=export_format.media_type,
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+
+    @router.post(path="", status_code=201, response_model=model)
+    def add_reading(
+        *,
+        session: Annotated[Session, Depends(get_session)],
+        input: Reading,  # noqa: A002
+    ) -> Reading:
+        try:
+            check_value(model=model, value=input.value)
+        except ValueError as err:
+            raise HTTPException(status_code=422, detail=str(err)) from err
+        reading = save_reading(session=session, model=model, reading=input)
+        update_rollups(session=session, model=model, datestamps=[reading.datestamp])
+        session.commit()
+        constants.readings_cache.invalidate(table=table)
+        # Read back with the metric's decimal places, whichever table stores it
+        return get_reading(session=session, model=model, datestamp=reading.datestamp)
+
+    @router.post(path="/import")
+    def import_file(
+        *,
+        session: Annotated[Session, Depends(get_session)],
+        file: UploadFile,
+        file_format: FileFormat = Query(alias="format", default=FileFormat.CSV),
+        policy: ConflictPolicy = ConflictPolicy.KEEP_MAX,
+    ) -> ImportResult:
+        try:
+            return import_readings(
+                session=session,
+                rows=read_rows(
+                    file=TextIOWrapper(file.file, encoding="utf-8"), file_format=file_format
+                ),
+                columns={"value": model},
+                policy=policy,
+            )
+        except ValueError as err:
+            raise HTTPException(status_code=422, detail=str(err)) from err
+        finally:
+            constants.readings_cache.invalidate(table=table)
+
+    @router.delete(path="", status_code=204)
+    def remove_reading(
+        *, session: Annotated[Session, Depends(get_session)], datestamp: date = Body(embed=True)
+    ) -> None:
+        reading = get_reading(session=session, model=model, datestamp=datestamp)
+        if not reading:
+            raise HTTPException(status_code=404, detail="Reading doesn't exist")
+        session.delete(reading)
+        update_rollups(session=session, model=model, datestamps=[datestamp])
+        session.commit()
+        constants.readings_cache.invalidate(table=table)
+
+    @router.put(path="", status_code=202)
+    async def refresh_readings(*, request: Request, force: bool = False) -> RefreshJob:
+        if not force and not get_stale_categories(categories=[metric.category]):
+            raise HTTPException(status_code=208, detail="No update needed")
+        return request.app.state.scheduler.enqueue(categories=[metric.category], force=force)
+
+    return router
@@ -0,0 +1,28 @@
+__all__ = ["router"]
+
+from fastapi import APIRouter, HTTPException, Request
+
+from weatherdan.ingest import CATEGORY_MODELS, get_stale_categories
+from weatherdan.responses import ErrorResponse
+from weatherdan.scheduler import RefreshJob
+
+router = APIRouter(
+    prefix="/refresh",
+    tags=["Refresh"],
+    responses={422: {"description": "Validation error", "model": ErrorResponse}},
+)
+
+
+@router.put(path="", status_code=202)
+async def refresh_all_readings(*, request: Request, force: bool = False) -> RefreshJob:
+    categories = list(CATEGORY_MODELS) if force else get_stale_categories(list(CATEGORY_MODELS))
+    if not categories:
+        raise HTTPException(status_code=208, detail="No update needed")
+    return request.app.state.scheduler.enqueue(categories=categories, force=force)
+
+
+@router.get(path="/{job_id}")
+async def get_refresh_job(*, request: Request, job_id: int) -> RefreshJob:
+    if job := request.app.state.scheduler.get_job(job_id=job_id):
+        return job
+    raise HTTPException(status_code=404, detail="Refresh job doesn't exist")
@@ -0,0 +1,49 @@
+__all__ = ["get_graph_data"]
+
+from weatherdan.constants import constants
+from weatherdan.database import run_session
+from weatherdan.metrics import Metric
+from weatherdan.models import GraphData
+from weatherdan.rollups import list_rollup_graph
+from weatherdan.samples import SAMPLE_TIMEFRAMES, list_sample_graph
+from weatherdan.timeframe import Timeframe
+
+
+async def get_graph_data(  # noqa: PLR0913
+    metric: Metric,
+    timeframe: Timeframe,
+    year: int | None,
+    month: int | None,
+    max_entries: int,
+    points: int,
+) -> GraphData:
+    # Shared by the metric graph and dashboard endpoints, so both use the same cached entries
+    key = (metric.model.__tablename__, "graph", timeframe, year, month, max_entries, points)
+    if timeframe in SAMPLE_TIMEFRAMES:
+        return await constants.readings_cache.get_or_create_async(
+            key=key,
+            factory=lambda: run_session(
+                function=lambda session: list_sample_graph(
+                    session=session,
+                    category=metric.category,
+                    timeframe=timeframe,
+                    year=year,
+                    month=month,
+                    max_entries=max_entries,
+                    points=points,
+                )
+            ),
+        )
+    return await constants.readings_cache.get_or_create_async(
+        key=key,
+        factory=lambda: run_session(
+            function=lambda session: list_rollup_graph(
+                session=session,
+                model=metric.model,
+                timeframe=timeframe,
+                year=year,
+                month=month,
+                max_entries=max_entries,
+            )
+        ),
+    )
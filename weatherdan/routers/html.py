@@ -1,15 +1,18 @@
 __all__ = ["router"]
 
+from collections.abc import Callable
 from typing import Annotated
 
 from fastapi import APIRouter, Cookie, Depends, Request
 from fastapi.responses import HTMLResponse, Response
 from fastapi.templating import Jinja2Templates
-from sqlmodel import Session, select
+from sqlmodel import Session
 
-from weatherdan import get_project_root
-from weatherdan.database import get_session
-from weatherdan.models import Rainfall, Solar, UVIndex, Wind
+from weatherdan import __version__, get_project_root
+from weatherdan.database import get_read_session
+from weatherdan.metrics import METRICS, Metric
+from weatherdan.rollups import list_months, list_years
+from weatherdan.routers.validators import get_validators, is_not_modified
 
 router = APIRouter(tags=["WebInterface"], include_in_schema=False)
 templates = Jinja2Templates(directory=str(get_project_root() / "templates"))
@@ -29,113 +32,45 @@ def editor(
     )
 
 
-@router.get("/rainfall", response_class=HTMLResponse)
-def rainfall(
-    *,
-    request: Request,
-    session: Annotated[Session, Depends(get_session)],
-    year: int = 0,
-    month: int = 0,
-    max_entries: int = Cookie(alias="weatherdan_max-entries", default=28),
-) -> Response:
-    year_list = sorted({x.datestamp.year for x in session.exec(select(Rainfall)).all()})
-    month_list = sorted(
-        {
-            x.datestamp.month
-            for x in session.exec(select(Rainfall)).all()
-            if x.datestamp.year == year
-        }
-    )
-
-    return templates.TemplateResponse(
-        "rainfall.html.jinja",
-        {
-            "request": request,
-            "max_entries": max_entries,
-            "year_list": year_list,
-            "month_list": month_list if year else [],
-            "year": year,
-            "month": month,
-        },
-    )
-
-
-@router.get("/solar", response_class=HTMLResponse)
-def solar(
-    *,
-    request: Request,
-    session: Annotated[Session, Depends(get_session)],
-    year: int = 0,
-    month: int = 0,
-    max_entries: int = Cookie(alias="weatherdan_max-entries", default=28),
-) -> Response:
-    year_list = sorted({x.datestamp.year for x in session.exec(select(Solar)).all()})
-    month_list = sorted(
-        {x.datestamp.month for x in session.exec(select(Solar)).all() if x.datestamp.year == year}
-    )
-
-    return templates.TemplateResponse(
-        "solar.html.jinja",
-        {
-            "request": request,
-            "max_entries": max_entries,
-            "year_list": year_list,
-            "month_list": month_list if year else [],
-            "year": year,
-            "month": month,
-        },
-    )
-
-
-@router.get("/uv-index", response_class=HTMLResponse)
-def uv_index(
-    *,
-    request: Request,
-    session: Annotated[Session, Depends(get_session)],
-    year: int = 0,
-    month: int = 0,
-    max_entries: int = Cookie(alias="weatherdan_max-entries", default=28),
-) -> Response:
-    year_list = sorted({x.datestamp.year for x in session.exec(select(UVIndex)).all()})
-    month_list = sorted(
-        {x.datestamp.month for x in session.exec(select(UVIndex)).all() if x.datestamp.year == year}
-    )
-
-    return templates.TemplateResponse(
-        "uv-index.html.jinja",
-        {
-            "request": request,
-            "max_entries": max_entries,
-            "year_list": year_list,
-            "month_list": month_list if year else [],
-            "year": year,
-            "month": month,
-        },
-    )
-
-
-@router.get("/wind", response_class=HTMLResponse)
-def wind(
-    *,
-    request: Request,
-    session: Annotated[Session, Depends(get_session)],
-    year: int = 0,
-    month: int = 0,
-    max_entries: int = Cookie(alias="weatherdan_max-entries", default=28),
-) -> Response:
-    year_list = sorted({x.datestamp.year for x in session.exec(select(Wind)).all()})
-    month_list = sorted(
-        {x.datestamp.month for x in session.exec(select(Wind)).all() if x.datestamp.year == year}
-    )
-
-    return templates.TemplateResponse(
-        "wind.html.jinja",
-        {
-            "request": request,
-            "max_entries": max_entries,
-            "year_list": year_list,
-            "month_list": month_list if year else [],
-            "year": year,
-            "month": month,
-        },
+def create_page(metric: Metric) -> Callable[..., Response]:
+    model = metric.model
+
+    def page(
+        *,
+        request: Request,
+        session: Annotated[Session, Depends(get_read_session)],
+        year: int = 0,
+        month: int = 0,
+        max_entries: int = Cookie(alias="weatherdan_max-entries", default=28),
+    ) -> Response:
+        headers = get_validators(model.__tablename__, extra=f"{__version__}|{max_entries}")
+        headers["Vary"] = "Cookie"
+        if is_not_modified(request=request, headers=headers):
+            return Response(status_code=304, headers=headers)
+
+        year_list = list_years(session=session, model=model)
+        month_list = list_months(session=session, model=model, year=year) if year else []
+
+        return templates.TemplateResponse(
+            f"{metric.slug}.html.jinja",
+            {
+                "request": request,
+                "max_entries": max_entries,
+                "year_list": year_list,
+                "month_list": month_list,
+                "year": year,
+                "month": month,
+            },
+            headers=headers,
+        )
+
+    return page
+
+
+for metric in METRICS.values():
+    router.add_api_route(
+        path=f"/{metric.slug}",
+        endpoint=create_page(metric=metric),
+        response_class=HTMLResponse,
+        methods=["GET"],
     )
@@ -0,0 +1,39 @@
+__all__ = ["get_validators", "is_not_modified"]
+
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from hashlib import blake2b
+
+from fastapi import Request
+
+from weatherdan.constants import constants
+
+
+def get_validators(*tables: str, extra: str = "") -> dict[str, str]:
+    cache = constants.readings_cache
+    versions = {x: cache.get_version(table=x) for x in tables}
+    last_modified = max(x[1] for x in versions.values())
+    tag = blake2b(digest_size=12)
+    tag.update(cache.started.isoformat().encode())
+    for table, (generation, _) in sorted(versions.items()):
+        tag.update(f"|{table}:{generation}".encode())
+    tag.update(f"|{extra}".encode())
+    return {
+        "Cache-Control": "no-cache",
+        "ETag": f'"{tag.hexdigest()}"',
+        "Last-Modified": format_datetime(last_modified.replace(microsecond=0), usegmt=True),
+    }
+
+
+def is_not_modified(request: Request, headers: dict[str, str]) -> bool:
+    if if_none_match := request.headers.get("If-None-Match"):
+        etags = {x.strip().removeprefix("W/") for x in if_none_match.split(",")}
+        return "*" in etags or headers["ETag"] in etags
+    if if_modified_since := request.headers.get("If-Modified-Since"):
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        last_modified: datetime = parsedate_to_datetime(headers["Last-Modified"])
+        return since.tzinfo is not None and last_modified <= since
+    return False
@@ -0,0 +1,245 @@
+__all__ = [
+    "SAMPLE_SCALE",
+    "SAMPLE_TIMEFRAMES",
+    "decode_value",
+    "downsample",
+    "encode_value",
+    "get_sample_series",
+    "list_daily_highs",
+    "list_sample_graph",
+    "upsert_samples",
+]
+
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from sqlalchemy import ColumnElement, and_, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, func, select
+from sqlmodel.sql.expression import SelectOfScalar
+
+from weatherdan.ecowitt.category import Category
+from weatherdan.models import GraphData, Sample, SampleReading
+from weatherdan.queries import get_date_range
+from weatherdan.series import SampleSeries
+from weatherdan.timeframe import Timeframe
+
+# Samples are stored as integer thousandths, Ecowitt reports at most 2 decimal places
+SAMPLE_SCALE = 3
+SAMPLE_TIMEFRAMES = (Timeframe.RAW, Timeframe.HOURLY)
+HOUR = 60 * 60
+
+
+def encode_value(value: Decimal) -> int:
+    return int(value.scaleb(SAMPLE_SCALE).to_integral_value())
+
+
+def decode_value(value: int) -> Decimal:
+    return Decimal(value).scaleb(-SAMPLE_SCALE)
+
+
+def get_timestamp(value: date) -> int:
+    return int(datetime.combine(value, time()).timestamp())
+
+
+def upsert_samples(
+    session: Session, category: Category, device: str, readings: dict[datetime, Decimal]
+) -> None:
+    insert = postgresql.insert if session.get_bind().dialect.name == "postgresql" else sqlite.insert
+    entries = [
+        {
+            "category": category,
+            "timestamp": int(key.timestamp()),
+            "device": device,
+            "value": encode_value(value=value),
+        }
+        for key, value in sorted(readings.items())
+    ]
+    if not entries:
+        return
+    statement = insert(Sample)
+    statement = statement.on_conflict_do_update(
+        index_elements=[Sample.category, Sample.timestamp, Sample.device],
+        set_={"value": statement.excluded.value},
+    )
+    session.execute(statement, entries)
+
+
+def list_daily_highs(
+    session: Session, category: Category, start: date | None = None, end: date | None = None
+) -> dict[date, Decimal]:
+    statement = select(Sample.timestamp, Sample.value).where(Sample.category == category)
+    if start:
+        statement = statement.where(Sample.timestamp >= get_timestamp(value=start))
+    if end:
+        statement = statement.where(Sample.timestamp < get_timestamp(value=end + timedelta(days=1)))
+    highs = {}
+    for timestamp, value in session.exec(statement):
+        key = datetime.fromtimestamp(timestamp).date()
+        if key not in highs or value > highs[key]:
+            highs[key] = value
+    return {key: decode_value(value=value) for key, value in highs.items()}
+
+
+def downsample(points: list[tuple[int, ...]], threshold: int) -> list[tuple[int, ...]]:
+    # Largest-Triangle-Three-Buckets on the first two fields, keeps the first and last points and
+    # the most prominent point from each bucket in between
+    if threshold <= 0 or len(points) <= max(threshold, 3):
+        return points
+    threshold = max(threshold, 3)
+    every = (len(points) - 2) / (threshold - 2)
+    sampled = [points[0]]
+    previous = 0
+    for index in range(threshold - 2):
+        next_start = int((index + 1) * every) + 1
+        next_end = min(int((index + 2) * every) + 1, len(points))
+        next_bucket = points[next_start:next_end]
+        avg_x = sum(x[0] for x in next_bucket) / len(next_bucket)
+        avg_y = sum(x[1] for x in next_bucket) / len(next_bucket)
+
+        prev_x, prev_y = points[previous][:2]
+        max_area = -1
+        for position in range(int(index * every) + 1, next_start):
+            x, y = points[position][:2]
+            area = abs((prev_x - avg_x) * (y - prev_y) - (prev_x - x) * (avg_y - prev_y))
+            if area > max_area:
+                max_area = area
+                selected = position
+        sampled.append(points[selected])
+        previous = selected
+    sampled.append(points[-1])
+    return sampled
+
+
+def get_hour_shift() -> int:
+    # Seconds past the UTC hour that local hours start at, non-zero for half and quarter hour
+    # timezones. Uses the current offset, so only a DST change that isn't a whole hour misaligns
+    return int(datetime.now().astimezone().utcoffset().total_seconds()) % HOUR
+
+
+def select_samples(
+    category: Category, timeframe: Timeframe, *columns: ColumnElement
+) -> tuple[SelectOfScalar, ColumnElement]:
+    if timeframe == Timeframe.RAW:
+        bucket = Sample.timestamp
+    else:
+        # Hours start on local hours, to match the local dates daily readings use
+        shift = get_hour_shift()
+        bucket = (Sample.timestamp - shift) // HOUR * HOUR + shift
+    statement = select(bucket, *columns).where(Sample.category == category).group_by(bucket)
+    return statement, bucket
+
+
+def list_date_ranges(
+    session: Session, category: Category, year: int | None = None, month: int | None = None
+) -> list[tuple[date, date]]:
+    if year:
+        date_range = get_date_range(year=year, month=month)
+        return [date_range] if date_range else []
+    # Month without a year covers that month of every year with samples
+    first, last = session.exec(
+        select(func.min(Sample.timestamp), func.max(Sample.timestamp)).where(
+            Sample.category == category
+        )
+    ).one()
+    if first is None:
+        return []
+    years = range(datetime.fromtimestamp(first).year, datetime.fromtimestamp(last).year + 1)
+    return [x for x in (get_date_range(year=y, month=month) for y in years) if x]
+
+
+def list_sample_rows(  # noqa: PLR0913
+    statement: SelectOfScalar,
+    bucket: ColumnElement,
+    session: Session,
+    category: Category,
+    year: int | None = None,
+    month: int | None = None,
+    max_entries: int = 28,
+    points: int = 0,
+) -> list[tuple[int, ...]]:
+    if year or month:
+        if not (
+            date_ranges := list_date_ranges(
+                session=session, category=category, year=year, month=month
+            )
+        ):
+            return []
+        statement = statement.where(
+            or_(
+                *(
+                    and_(
+                        Sample.timestamp >= get_timestamp(value=start),
+                        Sample.timestamp < get_timestamp(value=end),
+                    )
+                    for start, end in date_ranges
+                )
+            )
+        )
+    statement = statement.order_by(bucket.desc())
+    # Downsampling picks points from the whole range, a limit would only leave its newest entries
+    if max_entries > 0 and not points:
+        statement = statement.limit(max_entries)
+    return downsample(points=list(reversed(session.exec(statement).all())), threshold=points)
+
+
+def get_sample_series(  # noqa: PLR0913
+    session: Session,
+    category: Category,
+    timeframe: Timeframe,
+    year: int | None = None,
+    month: int | None = None,
+    max_entries: int = 28,
+    points: int = 0,
+) -> SampleSeries:
+    statement, bucket = select_samples(category, timeframe, func.max(Sample.value))
+    return SampleSeries.from_rows(
+        (timestamp, decode_value(value=value))
+        for timestamp, value in list_sample_rows(
+            statement=statement,
+            bucket=bucket,
+            session=session,
+            category=category,
+            year=year,
+            month=month,
+            max_entries=max_entries,
+            points=points,
+        )
+    )
+
+
+def list_sample_graph(  # noqa: PLR0913
+    session: Session,
+    category: Category,
+    timeframe: Timeframe,
+    year: int | None = None,
+    month: int | None = None,
+    max_entries: int = 28,
+    points: int = 0,
+) -> GraphData:
+    statement, bucket = select_samples(
+        category,
+        timeframe,
+        func.max(Sample.value),
+        func.sum(Sample.value),
+        func.count(),
+        func.min(Sample.value),
+    )
+    graph_data = GraphData()
+    for key, high, scaled_total, count, low in list_sample_rows(
+        statement=statement,
+        bucket=bucket,
+        session=session,
+        category=category,
+        year=year,
+        month=month,
+        max_entries=max_entries,
+        points=points,
+    ):
+        timestamp = datetime.fromtimestamp(key).astimezone()
+        total = decode_value(value=scaled_total)
+        graph_data.total.append(SampleReading(timestamp=timestamp, value=total))
+        graph_data.high.append(SampleReading(timestamp=timestamp, value=decode_value(value=high)))
+        graph_data.average.append(SampleReading(timestamp=timestamp, value=round(total / count, 2)))
+        graph_data.low.append(SampleReading(timestamp=timestamp, value=decode_value(value=low)))
+    return graph_data
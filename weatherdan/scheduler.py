@@ -0,0 +1,112 @@
+__all__ = ["JobStatus", "RefreshJob", "Scheduler"]
+
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from enum import Enum
+from itertools import count
+from typing import Self
+
+from pydantic import BaseModel
+from sqlmodel import Session
+
+from weatherdan.database import engine
+from weatherdan.ecowitt.category import Category
+from weatherdan.ingest import CATEGORY_MODELS, refresh_categories
+
+LOGGER = logging.getLogger(__name__)
+
+
+class JobStatus(Enum):
+    QUEUED = "Queued"
+    RUNNING = "Running"
+    SUCCEEDED = "Succeeded"
+    FAILED = "Failed"
+
+
+class RefreshJob(BaseModel):
+    id: int
+    status: JobStatus = JobStatus.QUEUED
+    categories: list[Category]
+    force: bool = False
+    queued: datetime
+    started: datetime | None = None
+    finished: datetime | None = None
+    error: str | None = None
+
+
+class Scheduler:
+    def __init__(self: Self, interval: timedelta, history_size: int = 20):
+        self.interval = interval
+        self.history_size = history_size
+        self.jobs: OrderedDict[int, RefreshJob] = OrderedDict()
+        self._ids = count(1)
+        self._pending: RefreshJob | None = None
+        self._event = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def enabled(self: Self) -> bool:
+        return self.interval > timedelta()
+
+    def start(self: Self) -> None:
+        if self.enabled:
+            self.enqueue(categories=list(CATEGORY_MODELS))
+        else:
+            LOGGER.info("Scheduled refreshes are disabled")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self: Self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def enqueue(self: Self, categories: list[Category], force: bool = False) -> RefreshJob:
+        # Only call from the event loop, asyncio.Event isn't thread-safe
+        if self._pending is not None:
+            self._pending.categories.extend(
+                x for x in categories if x not in self._pending.categories
+            )
+            self._pending.force |= force
+            return self._pending
+        self._pending = RefreshJob(
+            id=next(self._ids), categories=list(categories), force=force, queued=datetime.now()
+        )
+        self.jobs[self._pending.id] = self._pending
+        while len(self.jobs) > self.history_size:
+            self.jobs.popitem(last=False)
+        self._event.set()
+        return self._pending
+
+    def get_job(self: Self, job_id: int) -> RefreshJob | None:
+        return self.jobs.get(job_id)
+
+    async def _run(self: Self) -> None:
+        timeout = self.interval.total_seconds() if self.enabled else None
+        # Single consumer, so at most one refresh talks to Ecowitt at a time
+        while True:
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout=timeout)
+            except TimeoutError:
+                self.enqueue(categories=list(CATEGORY_MODELS), force=True)
+            self._event.clear()
+            job, self._pending = self._pending, None
+            if job is not None:
+                await self._process(job=job)
+
+    async def _process(self: Self, job: RefreshJob) -> None:
+        job.status = JobStatus.RUNNING
+        job.started = datetime.now()
+        try:
+            with Session(engine) as session:
+                await refresh_categories(
+                    session=session, categories=job.categories, force=job.force
+                )
+            job.status = JobStatus.SUCCEEDED
+        except Exception as err:
+            LOGGER.exception("Refresh job %s failed", job.id)
+            job.status = JobStatus.FAILED
+            job.error = str(err)
+        job.finished = datetime.now()
@@ -0,0 +1,141 @@
+__all__ = ["Layout", "SampleSeries", "Series"]
+
+from array import array
+from collections.abc import Iterable
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Self
+
+from weatherdan.models import Reading, SampleReading, WeekReading
+
+
+class Layout(Enum):
+    ROWS = "Rows"
+    COLUMNS = "Columns"
+
+
+def format_timestamp(value: int) -> str:
+    # Matches pydantic, which writes a zero UTC offset as Z
+    timestamp = datetime.fromtimestamp(value).astimezone().isoformat()
+    return timestamp.removesuffix("+00:00") + "Z" if timestamp.endswith("+00:00") else timestamp
+
+
+class Series:
+    __slots__ = ("_rendered", "end_ordinals", "ordinals", "values")
+
+    def __init__(
+        self: Self, ordinals: array, values: list[Decimal], end_ordinals: array | None = None
+    ):
+        self.ordinals = ordinals
+        self.end_ordinals = end_ordinals
+        self.values = values
+        self._rendered: dict[Layout, bytes] = {}
+
+    def __len__(self: Self) -> int:
+        return len(self.ordinals)
+
+    @classmethod
+    def from_rows(cls: type[Self], rows: Iterable[tuple[date, Decimal]]) -> Self:
+        ordinals = array("l")
+        values = []
+        for datestamp, value in rows:
+            ordinals.append(datestamp.toordinal())
+            values.append(value)
+        return cls(ordinals=ordinals, values=values)
+
+    @classmethod
+    def from_week_rows(cls: type[Self], rows: Iterable[tuple[date, date, Decimal]]) -> Self:
+        ordinals = array("l")
+        end_ordinals = array("l")
+        values = []
+        for start, end, value in rows:
+            ordinals.append(start.toordinal())
+            end_ordinals.append(end.toordinal())
+            values.append(value)
+        return cls(ordinals=ordinals, values=values, end_ordinals=end_ordinals)
+
+    def to_readings(self: Self) -> list[Reading | WeekReading]:
+        if self.end_ordinals is None:
+            return [
+                Reading(datestamp=date.fromordinal(x), value=y)
+                for x, y in zip(self.ordinals, self.values, strict=True)
+            ]
+        return [
+            WeekReading(
+                start_datestamp=date.fromordinal(x), end_datestamp=date.fromordinal(y), value=z
+            )
+            for x, y, z in zip(self.ordinals, self.end_ordinals, self.values, strict=True)
+        ]
+
+    def _render_rows(self: Self) -> str:
+        # Matches the output of serialising the equivalent Reading/WeekReading list
+        if self.end_ordinals is None:
+            entries = (
+                f'{{"datestamp":"{date.fromordinal(x)}","value":"{y}"}}'
+                for x, y in zip(self.ordinals, self.values, strict=True)
+            )
+        else:
+            entries = (
+                f'{{"start_datestamp":"{date.fromordinal(x)}",'
+                f'"end_datestamp":"{date.fromordinal(y)}","value":"{z}"}}'
+                for x, y, z in zip(self.ordinals, self.end_ordinals, self.values, strict=True)
+            )
+        return f"[{','.join(entries)}]"
+
+    def _render_columns(self: Self) -> str:
+        dates = ",".join(f'"{date.fromordinal(x)}"' for x in self.ordinals)
+        # Decimal strings like the rows layout, JSON numbers would lose precision in clients
+        values = ",".join(f'"{x}"' for x in self.values)
+        if self.end_ordinals is None:
+            return f'{{"dates":[{dates}],"values":[{values}]}}'
+        end_dates = ",".join(f'"{date.fromordinal(x)}"' for x in self.end_ordinals)
+        return f'{{"dates":[{dates}],"end_dates":[{end_dates}],"values":[{values}]}}'
+
+    def to_json(self: Self, layout: Layout = Layout.ROWS) -> bytes:
+        if layout not in self._rendered:
+            rendered = self._render_columns() if layout == Layout.COLUMNS else self._render_rows()
+            self._rendered[layout] = rendered.encode()
+        return self._rendered[layout]
+
+
+class SampleSeries:
+    __slots__ = ("_rendered", "timestamps", "values")
+
+    def __init__(self: Self, timestamps: array, values: list[Decimal]):
+        self.timestamps = timestamps
+        self.values = values
+        self._rendered: dict[Layout, bytes] = {}
+
+    def __len__(self: Self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def from_rows(cls: type[Self], rows: Iterable[tuple[int, Decimal]]) -> Self:
+        timestamps = array("q")
+        values = []
+        for timestamp, value in rows:
+            timestamps.append(timestamp)
+            values.append(value)
+        return cls(timestamps=timestamps, values=values)
+
+    def to_readings(self: Self) -> list[SampleReading]:
+        return [
+            SampleReading(timestamp=datetime.fromtimestamp(x).astimezone(), value=y)
+            for x, y in zip(self.timestamps, self.values, strict=True)
+        ]
+
+    def to_json(self: Self, layout: Layout = Layout.ROWS) -> bytes:
+        if layout not in self._rendered:
+            if layout == Layout.COLUMNS:
+                timestamps = ",".join(f'"{format_timestamp(value=x)}"' for x in self.timestamps)
+                values = ",".join(f'"{x}"' for x in self.values)
+                rendered = f'{{"timestamps":[{timestamps}],"values":[{values}]}}'
+            else:
+                entries = ",".join(
+                    f'{{"timestamp":"{format_timestamp(value=x)}","value":"{y}"}}'
+                    for x, y in zip(self.timestamps, self.values, strict=True)
+                )
+                rendered = f"[{entries}]"
+            self._rendered[layout] = rendered.encode()
+        return self._rendered[layout]
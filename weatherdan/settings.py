@@ -4,7 +4,7 @@
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import ClassVar, Self
+from typing import ClassVar, Literal, Self
 
 import tomli_w as tomlwriter
 from pydantic import BaseModel
@@ -28,11 +28,29 @@ class Source(str, Enum):
     SQLITE = "SQLITE"
 
 
+class SqliteSettings(SettingsModel):
+    busy_timeout: int = 5000
+    cache_size: int = -65536
+    journal_mode: Literal["DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"] = "WAL"
+    mmap_size: int = 268435456
+    read_only_pool: bool = True
+    synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    temp_store: Literal["DEFAULT", "FILE", "MEMORY"] = "MEMORY"
+
+
 class DatabaseSettings(SettingsModel):
+    asynchronous: bool = False
     database_name: str = str(get_data_root() / "weatherdan.sqlite")
+    fixed_point: bool = False
     host: str = ""
+    max_overflow: int = 10
     password: str = ""
+    pool_pre_ping: bool = False
+    pool_recycle: int = -1
+    pool_size: int = 5
     source: Source = Source.SQLITE
+    sqlite: SqliteSettings = SqliteSettings()
+    unified_readings: bool = False
     user: str = ""
 
     @property
@@ -43,10 +61,24 @@ def db_url(self: Self) -> str:
             )
         return f"sqlite:///{self.database_name}"
 
+    @property
+    def read_db_url(self: Self) -> str:
+        if self.source == Source.POSTGRES or not self.sqlite.read_only_pool:
+            return self.db_url
+        return f"sqlite:///{Path(self.database_name).resolve().as_uri()}?mode=ro&uri=true"
+
+    @property
+    def async_db_url(self: Self) -> str:
+        # The async engine only serves reads. psycopg serves both modes from the same URL
+        if self.source == Source.POSTGRES:
+            return self.db_url
+        return self.read_db_url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+
 
 class EcowittSettings(SettingsModel):
     application_key: str = ""
     api_key: str = ""
+    refresh_interval: int = 180
 
 
 class UpdateSettings(SettingsModel):
@@ -57,6 +89,7 @@ class UpdateSettings(SettingsModel):
 
 
 class WebsiteSettings(SettingsModel):
+    cache_size: int = 256
     host: str = "127.0.0.1"
     port: int = 25710
     reload: bool = False
@@ -0,0 +1,170 @@
+__all__ = [
+    "UNIFIED_READINGS",
+    "check_value",
+    "convert_values",
+    "copy_readings",
+    "get_reading",
+    "get_source",
+    "get_view",
+    "list_unconverted",
+    "round_readings",
+    "save_reading",
+]
+
+from datetime import date
+from decimal import Decimal
+from functools import cache
+
+from sqlalchemy import BigInteger, Column, Integer, Table, insert, inspect, literal, type_coerce
+from sqlalchemy.orm import aliased
+from sqlalchemy.types import TypeEngine
+from sqlmodel import Session, SQLModel, delete, select
+
+from weatherdan.constants import constants
+from weatherdan.models import READING_SCALE, MetricReading, Reading, ScaledDecimal
+
+UNIFIED_READINGS = constants.settings.database.unified_readings
+
+
+@cache
+def get_view(model: type[Reading]) -> type[Reading]:
+    # Exposes the category's rows of the unified table under the category model's column names,
+    # so the same query code reads either storage. The subquery is flattened by the planner.
+    # Values read back with the metric's decimal places rather than the unified column's
+    name = model.__tablename__
+    value_type = ScaledDecimal(
+        scale=READING_SCALE,
+        fixed_point=get_value_type(model=MetricReading).fixed_point,
+        places=get_value_type(model=model).scale,
+    )
+    subquery = (
+        select(
+            MetricReading.metric,
+            MetricReading.datestamp,
+            type_coerce(MetricReading.value, value_type).label("value"),
+        )
+        .where(MetricReading.metric == name)
+        .subquery(name=name)
+    )
+    return aliased(MetricReading, subquery, name=name, adapt_on_names=True)
+
+
+def get_source(model: type[Reading]) -> type[Reading]:
+    return get_view(model=model) if UNIFIED_READINGS else model
+
+
+def get_reading(session: Session, model: type[Reading], datestamp: date) -> Reading | None:
+    if UNIFIED_READINGS:
+        view = get_view(model=model)
+        statement = select(view).where(view.datestamp == datestamp)
+        return session.exec(statement.execution_options(populate_existing=True)).first()
+    return session.get(model, datestamp)
+
+
+def save_reading(session: Session, model: type[Reading], reading: Reading) -> Reading:
+    if entry := get_reading(session=session, model=model, datestamp=reading.datestamp):
+        entry.value = reading.value
+    elif UNIFIED_READINGS:
+        entry = MetricReading.model_validate(reading, update={"metric": model.__tablename__})
+    else:
+        entry = model.model_validate(reading)
+    session.add(entry)
+    return entry
+
+
+def get_value_type(model: type[SQLModel]) -> ScaledDecimal:
+    return model.__table__.columns["value"].type
+
+
+def check_value(model: type[Reading], value: Decimal) -> Decimal:
+    # Each metric keeps its own decimal places whichever table stores it, so a value is checked
+    # against its metric rather than the unified column
+    if (value_type := get_value_type(model=model)).fixed_point:
+        value_type.to_scaled(value=value)
+    return value
+
+
+def round_readings(model: type[Reading], readings: dict[date, Decimal]) -> dict[date, Decimal]:
+    # Ecowitt reports more decimal places than fixed point storage keeps for some metrics
+    value_type = get_value_type(model=model)
+    return {key: value_type.quantize(value=value) for key, value in readings.items()}
+
+
+def copy_readings(session: Session, model: type[Reading], reverse: bool = False) -> int:
+    # Replaces the category's readings in the target storage, so rerunning is safe. Fixed point
+    # integers are rescaled between the metric's decimal places and the unified column's
+    name = model.__tablename__
+    value_type = get_value_type(model=model)
+    factor = 10 ** (READING_SCALE - value_type.scale)
+    if reverse:
+        view = get_view(model=model)
+        value = (
+            type_coerce(view.value, BigInteger) // factor if value_type.fixed_point else view.value
+        )
+        session.exec(delete(model))
+        statement = insert(model).from_select(["datestamp", "value"], select(view.datestamp, value))
+    else:
+        value = (
+            type_coerce(model.value, BigInteger) * factor if value_type.fixed_point else model.value
+        )
+        session.exec(delete(MetricReading).where(MetricReading.metric == name))
+        statement = insert(MetricReading).from_select(
+            ["metric", "datestamp", "value"], select(literal(name), model.datestamp, value)
+        )
+    return session.execute(statement).rowcount
+
+
+def get_stored_type(column: Column, stored: TypeEngine) -> TypeEngine:
+    return ScaledDecimal(scale=column.type.scale, fixed_point=isinstance(stored, Integer))
+
+
+def list_unconverted(session: Session, tables: list[Table]) -> list[Table]:
+    # Tables whose values are stored differently to the fixed_point setting
+    inspector = inspect(session.connection())
+    unconverted = []
+    for table in tables:
+        columns = [x for x in table.columns if isinstance(x.type, ScaledDecimal)]
+        if not columns or not inspector.has_table(table.name):
+            continue
+        stored = {x["name"]: x["type"] for x in inspector.get_columns(table.name)}
+        if any(isinstance(stored[x.name], Integer) != x.type.fixed_point for x in columns):
+            unconverted.append(table)
+    return unconverted
+
+
+def convert_values(session: Session, table: Table, copy: bool = True) -> int:
+    # Recreates the table with the configured value storage. Every value is checked before the
+    # table is dropped, and the caller runs this inside a transaction that also covers the DDL
+    columns = [x for x in table.columns if isinstance(x.type, ScaledDecimal)]
+    connection = session.connection()
+    stored = {x["name"]: x["type"] for x in inspect(connection).get_columns(table.name)}
+    rows = []
+    if copy:
+        statement = select(
+            *(
+                type_coerce(x, get_stored_type(column=x, stored=stored[x.name])).label(x.name)
+                if isinstance(x.type, ScaledDecimal)
+                else x
+                for x in table.columns
+            )
+        )
+        rows = [x._asdict() for x in session.execute(statement)]
+    for row in rows:
+        for column in columns:
+            if column.type.fixed_point:
+                # The unified table keeps each value to its own metric's decimal places
+                value_type = (
+                    table.metadata.tables[row["metric"]].columns["value"].type
+                    if table.name == MetricReading.__tablename__
+                    else column.type
+                )
+                try:
+                    value_type.to_scaled(value=row[column.name])
+                except ValueError as err:
+                    msg = f"Unable to convert {table.name} {row}: {err}"
+                    raise ValueError(msg) from err
+    table.drop(connection)
+    table.create(connection)
+    if rows:
+        session.execute(insert(table), rows)
+    return len(rows)
@@ -4,6 +4,8 @@
 
 
 class Timeframe(Enum):
+    RAW = "Raw"
+    HOURLY = "Hourly"
     DAILY = "Daily"
     WEEKLY = "Weekly"
     MONTHLY = "Monthly"